@@ -0,0 +1,137 @@
+#Synthetic Sales Data Generator
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"
+
+# (ProductID, names seen in the real export, typical unit price)
+PRODUCTS = [
+    ("P101", ["Laptop", "Laptop,Premium"], 65000),
+    ("P102", ["Mouse", "Mouse,Wireless"], 650),
+    ("P103", ["Keyboard", "Keyboard,Mechanical"], 2000),
+    ("P104", ["Monitor", "Monitor,LED"], 16000),
+    ("P105", ["Webcam", "Webcam,HD"], 3200),
+    ("P106", ["Headphones"], 4500),
+    ("P107", ["USB Cable"], 250),
+    ("P108", ["External Hard Drive", "External Hard Drive,1TB"], 5000),
+    ("P109", ["Wireless Mouse", "Wireless Mouse,Gaming"], 900),
+    ("P110", ["Laptop Charger"], 1900)
+]
+REGIONS = ["North", "South", "East", "West"]
+
+SIZES = {               ## Named sizes accepted by --size
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+    "100m": 100_000_000
+}
+
+# Share of rows carrying each kind of dirt found in the real export
+DIRTY_RATES = {
+    "comma_price": 0.05,        ## 1,916 instead of 1916
+    "zero_quantity": 0.01,
+    "missing_region": 0.01,
+    "bad_transaction_id": 0.01,     ## X042 instead of T042
+    "bad_product_id": 0.005,
+    "bad_customer_id": 0.005,
+    "blank_line": 0.002
+}
+
+
+def parse_size(value):
+    """
+    Turns '10k', '1m', '2500' etc. into a row count
+    """
+    value = value.strip().lower()
+    if value in SIZES:
+        return SIZES[value]
+    if value[-1:] in ("k", "m"):
+        return int(float(value[:-1]) * (1_000 if value[-1] == "k" else 1_000_000))
+    return int(value)
+
+
+def iter_sales_lines(rows, seed=42, customers=None, days=31, start=date(2024, 12, 1)):
+    """
+    Yields `rows` pipe-delimited transaction lines (without newlines)
+
+    The same seed always produces the same lines.
+    """
+    rng = random.Random(seed)
+    customers = customers or max(50, rows // 200)       ## Roughly 200 orders per customer
+    width = max(3, len(str(customers)))     ## C001 style, like the real export
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(days)]
+
+    for i in range(1, rows + 1):
+        product_id, names, price = rng.choice(PRODUCTS)
+        product_name = rng.choice(names)
+        unit_price = max(1, int(rng.gauss(price, price * 0.2)))
+        quantity = rng.randint(1, 10)
+        transaction_id = f"T{i:09d}"
+        customer_id = f"C{rng.randint(1, customers):0{width}d}"
+        region = rng.choice(REGIONS)
+
+        # ---------------- Dirty cases ----------------
+        roll = rng.random()
+        unit_price = f"{unit_price:,}" if roll < DIRTY_RATES["comma_price"] else str(unit_price)
+
+        roll = rng.random()
+        if roll < DIRTY_RATES["zero_quantity"]:
+            quantity = 0
+        elif roll < DIRTY_RATES["zero_quantity"] + DIRTY_RATES["missing_region"]:
+            region = ""
+
+        roll = rng.random()
+        if roll < DIRTY_RATES["bad_transaction_id"]:
+            transaction_id = "X" + transaction_id[1:]
+        elif roll < DIRTY_RATES["bad_transaction_id"] + DIRTY_RATES["bad_product_id"]:
+            product_id = product_id[1:]
+        elif roll < (DIRTY_RATES["bad_transaction_id"] + DIRTY_RATES["bad_product_id"]
+                     + DIRTY_RATES["bad_customer_id"]):
+            customer_id = "X" + customer_id[1:]
+
+        if rng.random() < DIRTY_RATES["blank_line"]:
+            yield ""
+
+        yield "|".join((transaction_id, rng.choice(dates), product_id, product_name,
+                        str(quantity), unit_price, customer_id, region))
+
+
+def generate_sales_file(path, rows, seed=42, buffer_rows=10_000):
+    """
+    Writes a synthetic sales file with the production schema
+
+    Returns: path
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(HEADER + "\n")
+        buffer = []
+        for line in iter_sales_lines(rows, seed):
+            buffer.append(line)
+            if len(buffer) >= buffer_rows:      ## Write in blocks to keep memory flat
+                f.write("\n".join(buffer) + "\n")
+                buffer.clear()
+        if buffer:
+            f.write("\n".join(buffer) + "\n")
+
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic pipe-delimited sales file")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--size", default="10k",
+                        help="rows to write: 10k, 1m, 10m, 100m or a number (default: 10k)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    args = parser.parse_args(argv)
+
+    rows = parse_size(args.size)
+    generate_sales_file(args.output, rows, args.seed)
+    print(f"Wrote {rows:,} transactions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#Benchmark Regression Gate
+import argparse
+import json
+import os
+import sys
+from statistics import median
+
+if __package__ in (None, ""):      ## Run as a script: make the repo root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import BENCH_DIR, DEFAULT_SIZES, run_benchmarks
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")    ## Machine specific, so not committed
+TIME_TOLERANCE = 0.20           ## Allowed throughput drop (20%)
+TIME_FLOOR_S = 0.05             ## Slowdowns smaller than 50 ms are noise, unless the stage at least doubled
+MEMORY_TOLERANCE = 0.20         ## Allowed peak memory growth (20%)
+MEMORY_FLOOR_BYTES = 1 << 20    ## Peaks below 1 MB are too noisy to gate on
+DEFAULT_REPEAT = 5
+
+
+def median_of(runs, memory_run=None):
+    """
+    Merges repeated benchmark results into the median figure per benchmark
+
+    The median ignores one-off stalls in either direction, unlike the best
+    or the mean of the runs. memory_run, if given, supplies the peak memory
+    figures (timed runs are best made without tracemalloc, which slows
+    every allocation down by a varying amount).
+    """
+    collected = {}
+    for run in runs:
+        for label, benches in run["sizes"].items():
+            for name, record in benches.items():
+                collected.setdefault(label, {}).setdefault(name, []).append(record)
+
+    merged = {"repeat": len(runs), "sizes": {}}
+    for label, benches in collected.items():
+        merged_benches = merged["sizes"][label] = {}
+
+        for name, records in benches.items():
+            wall = median(r["wall_s"] for r in records)
+            if memory_run is not None:
+                traced = memory_run["sizes"].get(label, {}).get(name, {})
+                peaks = [traced.get("peak_mem_bytes")]
+            else:
+                peaks = [r["peak_mem_bytes"] for r in records]
+            peaks = [peak for peak in peaks if peak is not None]
+            rows = records[0]["rows"]
+            merged_benches[name] = {
+                "rows": rows,
+                "wall_s": wall,
+                "cpu_s": median(r["cpu_s"] for r in records),
+                "peak_mem_bytes": median(peaks) if peaks else None,
+                "rows_per_s": rows / wall if wall else None
+            }
+
+    return merged
+
+
+def compare_results(baseline, current, time_tolerance=TIME_TOLERANCE,
+                    memory_tolerance=MEMORY_TOLERANCE, memory_floor=MEMORY_FLOOR_BYTES,
+                    time_floor=TIME_FLOOR_S):
+    """
+    Compares current benchmark results with the stored baseline
+
+    A throughput drop only counts when it is beyond time_tolerance and the
+    stage also got at least time_floor seconds slower, or at least twice as
+    slow (so stages far below the floor are still gated). A size or
+    benchmark on one side only is a failure: the baseline has to be
+    re-recorded when the suite changes.
+
+    Returns: list of comparison dicts (size, benchmark, metric, baseline,
+    current, change, regressed)
+    """
+    comparisons = []
+
+    def missing(label, name, side):
+        comparisons.append({
+            "size": label, "benchmark": name, "metric": f"missing ({side})",
+            "baseline": None, "current": None, "change": None, "regressed": True
+        })
+
+    for label in baseline["sizes"]:
+        if label not in current["sizes"]:
+            missing(label, "*", "current")
+
+    for label, benches in current["sizes"].items():
+        baseline_benches = baseline["sizes"].get(label)
+        if baseline_benches is None:
+            missing(label, "*", "baseline")
+            continue
+
+        for name in baseline_benches:
+            if name not in benches:
+                missing(label, name, "current")
+
+        for name, record in benches.items():
+            base = baseline_benches.get(name)
+            if base is None:
+                missing(label, name, "baseline")
+                continue
+
+            if base.get("rows_per_s") and record.get("rows_per_s"):
+                change = record["rows_per_s"] / base["rows_per_s"] - 1
+                slower_by = record["wall_s"] - base["wall_s"]
+                floor = min(time_floor, base["wall_s"])     ## Relative for stages faster than the floor
+                comparisons.append({
+                    "size": label, "benchmark": name, "metric": "rows_per_s",
+                    "baseline": base["rows_per_s"], "current": record["rows_per_s"],
+                    "change": change, "regressed": change < -time_tolerance and slower_by >= floor
+                })
+
+            base_mem, mem = base.get("peak_mem_bytes"), record.get("peak_mem_bytes")
+            if base_mem is not None and mem is not None and max(base_mem, mem) >= memory_floor:
+                change = mem / base_mem - 1 if base_mem else float("inf")
+                comparisons.append({
+                    "size": label, "benchmark": name, "metric": "peak_mem_bytes",
+                    "baseline": base_mem, "current": mem,
+                    "change": change, "regressed": change > memory_tolerance
+                })
+
+    return comparisons
+
+
+def print_comparisons(comparisons):
+    width = max([10] + [len(c["benchmark"]) for c in comparisons])
+    print(f"{'Size':<6} {'Benchmark':<{width}} {'Metric':<18} {'Baseline':>14} {'Current':>14} {'Change':>8}")
+    print("-" * (width + 65))
+
+    for c in comparisons:
+        flag = "  REGRESSED" if c["regressed"] else ""
+        if c["change"] is None:
+            print(f"{c['size']:<6} {c['benchmark']:<{width}} {c['metric']:<18} "
+                  f"{'-':>14} {'-':>14} {'-':>8}{flag}")
+            continue
+        print(f"{c['size']:<6} {c['benchmark']:<{width}} {c['metric']:<18} "
+              f"{c['baseline']:>14,.0f} {c['current']:>14,.0f} {c['change']:>+7.1%}{flag}")
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    """
+    Records a baseline, or checks the current code against it
+
+    Timings are machine specific, so the baseline is not committed. CI
+    records it on the same runner, from the target branch, before checking
+    the change:
+
+        git checkout <target>      && python -m benchmarks.regression_gate record --baseline base.json
+        git checkout <change>      && python -m benchmarks.regression_gate check --baseline base.json
+
+    Returns: exit code (1 when any benchmark regressed beyond tolerance or
+    is missing on one side, 2 without a baseline)
+    """
+    parser = argparse.ArgumentParser(description="Fail when benchmarks regress against a stored baseline")
+    parser.add_argument("command", choices=["record", "check"],
+                        help="record: store a new baseline; check: compare against it")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help=f"baseline results file (default: {BASELINE_FILE})")
+    parser.add_argument("--results", default=None,
+                        help="use an existing run_benchmarks JSON instead of running the suite")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"sizes to run (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per benchmark; the median counts (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--workers", type=int, default=None, help="processes for the parallel benchmarks")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE,
+                        help=f"allowed throughput drop as a fraction (default: {TIME_TOLERANCE})")
+    parser.add_argument("--time-floor", type=float, default=TIME_FLOOR_S,
+                        help=f"ignore slowdowns below this many seconds unless the stage at least "
+                             f"doubled (default: {TIME_FLOOR_S})")
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE,
+                        help=f"allowed peak memory growth as a fraction (default: {MEMORY_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    if args.results:
+        current = _load(args.results)
+    else:
+        sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+        timed = [run_benchmarks(sizes, workers=args.workers, trace_memory=False)
+                 for _ in range(max(args.repeat, 1))]
+        current = median_of(timed, memory_run=run_benchmarks(sizes, workers=args.workers))
+
+    if args.command == "record":
+        _save(args.baseline, current)
+        print(f"\nBaseline written to: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Error: No baseline at {args.baseline}. Run 'record' first.")
+        return 2
+
+    comparisons = compare_results(_load(args.baseline), current,
+                                  args.time_tolerance, args.memory_tolerance, time_floor=args.time_floor)
+    print()
+    print_comparisons(comparisons)
+
+    regressions = [c for c in comparisons if c["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond tolerance")
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
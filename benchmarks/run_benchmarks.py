@@ -0,0 +1,220 @@
+#Ingestion And Analytics Benchmark Suite
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+if __package__ in (None, ""):      ## Run as a script: make the repo root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_sales_data import generate_sales_file, parse_size
+from utils.api_handler import enrich_sales_data
+from utils.bitmap_index import BitmapIndex
+from utils.data_processor import (aggregate_sales, calculate_total_revenue, customer_analysis,
+                                  daily_sales_trend, find_peak_sales_day, low_performing_products,
+                                  region_wise_sales, top_selling_products)
+from utils.file_handler import parse_transactions, read_sales_data, save_enriched_data, validate_and_filter
+from utils.instrumentation import PipelineProfiler
+from utils.mmap_reader import parse_file_mmap
+from utils.parallel_reader import aggregate_file_parallel, parse_file_parallel
+from utils.report_generator import generate_sales_report
+from utils.sales_cube import build_sales_cube
+from utils.table_index import TableIndex
+
+BENCH_DIR = ".bench"            ## Generated input files are kept here between runs
+DEFAULT_SIZES = "10k"
+DICT_ROW_LIMIT = 1_000_000      ## List-of-dict benchmarks are skipped above this
+
+
+def _quiet():
+    """
+    Silences the progress prints of the functions being timed
+    """
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def input_file(rows, seed, bench_dir=BENCH_DIR):
+    """
+    Returns the synthetic file for a size, generating it on first use
+    """
+    path = os.path.join(bench_dir, f"sales_{rows}_{seed}.txt")
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} rows -> {path}")
+        generate_sales_file(path, rows, seed)
+    return path
+
+
+def _analysis_views(aggregates):
+    calculate_total_revenue(aggregates)
+    region_wise_sales(aggregates)
+    top_selling_products(aggregates)
+    customer_analysis(aggregates)
+    daily_sales_trend(aggregates)
+    find_peak_sales_day(aggregates)
+    low_performing_products(aggregates)
+
+
+def run_size(path, rows, profiler, workers, include_dicts, output_dir):
+    """
+    Times every stage once on one input file
+
+    Each stage is recorded on the profiler under its own name.
+    """
+    # ---------------- Row-oriented (list of dicts) path ----------------
+    if include_dicts:
+        with profiler.stage("read_sales_data") as stage:
+            lines = read_sales_data(path, "utf-8")
+            stage["rows_out"] = len(lines)
+
+        with profiler.stage("parse_transactions", rows_in=len(lines)) as stage:
+            transactions = parse_transactions(lines)
+            stage["rows_out"] = len(transactions)
+        del lines
+
+        with profiler.stage("validate_dicts", rows_in=len(transactions)) as stage, _quiet():
+            valid, _ = validate_and_filter(transactions)
+            stage["rows_out"] = len(valid)
+
+        with profiler.stage("aggregate_dicts", rows_in=len(valid)) as stage:
+            aggregate_sales(valid)
+            stage["rows_out"] = len(valid)
+        del transactions, valid
+
+    # ---------------- Columnar path ----------------
+    with profiler.stage("parse_mmap_table") as stage:
+        table = parse_file_mmap(path, "utf-8", as_table=True)
+        stage["rows_out"] = len(table)
+
+    with profiler.stage("parse_parallel_table") as stage:
+        stage["rows_out"] = len(parse_file_parallel(path, "utf-8", workers, as_table=True))
+
+    with profiler.stage("validate_table", rows_in=len(table)) as stage, _quiet():
+        valid, _ = validate_and_filter(table)
+        stage["rows_out"] = len(valid)
+
+    with profiler.stage("index_table", rows_in=len(table)) as stage:
+        index = TableIndex(table)
+        stage["rows_out"] = len(index)
+
+    with profiler.stage("validate_indexed", rows_in=len(table)) as stage, _quiet():
+        regions = index.values("Region")
+        indexed, _ = validate_and_filter(table, regions[0] if regions else None, 100, 1000, index=index)
+        stage["rows_out"] = len(indexed)
+    del index, indexed
+
+    with profiler.stage("bitmap_index", rows_in=len(table)) as stage:
+        bitmaps = BitmapIndex(table)
+        stage["rows_out"] = len(bitmaps)
+
+    with profiler.stage("bitmap_counts", rows_in=len(table)):
+        for region in bitmaps.values("Region"):
+            bitmaps.filter_summary(region, 100, 1000)
+    del bitmaps
+
+    with profiler.stage("aggregate_table", rows_in=len(valid)) as stage:
+        aggregates = aggregate_sales(valid)
+        stage["rows_out"] = len(valid)
+
+    with profiler.stage("analysis_views"):
+        _analysis_views(aggregates)
+
+    with profiler.stage("sales_cube", rows_in=len(valid)) as stage:
+        cube = build_sales_cube(valid)
+        stage["rows_out"] = len(cube)
+
+    with profiler.stage("cube_views", rows_in=len(cube)):
+        _analysis_views(aggregate_sales(cube))
+    del cube
+
+    with profiler.stage("aggregate_parallel") as stage:
+        aggregates, summary = aggregate_file_parallel(path, "utf-8", workers)
+        stage["rows_out"] = summary["final_count"]
+    del table, valid
+
+    # ---------------- End to end (no network) ----------------
+    with profiler.stage("end_to_end") as stage, _quiet():
+        table = parse_file_mmap(path, "utf-8", as_table=True)
+        valid, _ = validate_and_filter(table)
+        aggregates = aggregate_sales(valid)
+        enriched = enrich_sales_data(valid, {})     ## Empty catalog: the API is not benchmarked
+        save_enriched_data(enriched, os.path.join(output_dir, "enriched.txt"))
+        generate_sales_report(aggregates, enriched, os.path.join(output_dir, "report.txt"))
+        stage["rows_out"] = len(valid)
+
+
+def run_benchmarks(sizes, seed=42, workers=None, trace_memory=True,
+                   dict_row_limit=DICT_ROW_LIMIT, bench_dir=BENCH_DIR):
+    """
+    Runs the suite for every size
+
+    Returns: {"sizes": {label: {benchmark: record}}} where each record holds
+    rows, wall_s, cpu_s, peak_mem_bytes and rows_per_s
+    """
+    results = {"seed": seed, "workers": workers, "sizes": {}}
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for label in sizes:
+            rows = parse_size(label)
+            path = input_file(rows, seed, bench_dir)
+
+            profiler = PipelineProfiler(trace_memory=trace_memory)
+            try:
+                run_size(path, rows, profiler, workers, rows <= dict_row_limit, output_dir)
+            finally:
+                profiler.stop()
+
+            print(f"\n== {label} ({rows:,} rows) ==")
+            profiler.print_table()
+
+            size_results = {}
+            for record in profiler.stages:
+                size_results[record["stage"]] = {
+                    "rows": rows,
+                    "wall_s": record["wall_s"],
+                    "cpu_s": record["cpu_s"],
+                    "peak_mem_bytes": record["peak_mem_bytes"],
+                    "rows_per_s": rows / record["wall_s"] if record["wall_s"] else None
+                }
+            results["sizes"][label] = size_results
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sales ingestion and analytics stages")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated sizes, e.g. 10k,1m,10m,100m (default: {DEFAULT_SIZES})")
+    parser.add_argument("--seed", type=int, default=42, help="data generator seed (default: 42)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for the parallel benchmarks (default: CPU count)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc (faster, no peak memory figures)")
+    parser.add_argument("--dict-row-limit", type=int, default=DICT_ROW_LIMIT,
+                        help="skip list-of-dict benchmarks above this many rows")
+    parser.add_argument("--bench-dir", default=BENCH_DIR, help="where generated inputs are kept")
+    parser.add_argument("--output", default=None, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        [size.strip() for size in args.sizes.split(",") if size.strip()],
+        seed=args.seed,
+        workers=args.workers,
+        trace_memory=not args.no_memory,
+        dict_row_limit=args.dict_row_limit,
+        bench_dir=args.bench_dir
+    )
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,118 +1,386 @@
 #Created main execution file
-def main():
+import argparse
+import os
+import sys
+
+from utils.file_handler import RowPredicate, encodings, validate_and_filter, save_enriched_data
+from utils.data_processor import aggregate_sales
+from utils.sales_cube import build_sales_cube, load_sales_cube
+from utils.mmap_reader import parse_file_mmap
+from utils.parallel_reader import parse_file_parallel
+from utils.parse_cache import CACHE_DIR, file_fingerprint, load_fresh_cache, load_transactions_cached, parser_key
+from utils.api_handler import (API_BASE_URL, MATCH_MODES, MAX_CONCURRENCY, create_product_mapping,
+                               distinct_enrichment_keys, enrich_sales_data)
+from utils.enrichment_store import EnrichmentStore
+from utils.catalog_cache import CATALOG_TTL, load_product_catalog
+from utils.http_client import RATE_LIMIT
+from utils.report_generator import enrichment_summary, generate_sales_report
+from utils.instrumentation import PipelineProfiler
+from utils.pipeline import Pipeline, Stage
+from utils.transaction_table import TransactionTable
+
+
+def parse_args(argv=None):
     """
-    Main execution function for Sales Analytics System
+    Command-line options for unattended (cron/batch/benchmark) runs
     """
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
 
-    print("=" * 30)           ## Header
-    print("SALES ANALYTICS SYSTEM")       ## Title      
+    parser.add_argument("inputs", nargs="*", default=["data/sales_data.txt"],
+                        help="pipe-delimited sales file(s) (default: data/sales_data.txt)")
+    parser.add_argument("--encoding", default=None,
+                        help="input encoding (default: sniffed from the file)")
+    parser.add_argument("--region", default=None, help="keep only this region")
+    parser.add_argument("--min-amount", type=float, default=None, help="minimum transaction amount")
+    parser.add_argument("--max-amount", type=float, default=None, help="maximum transaction amount")
+    parser.add_argument("--no-pushdown", action="store_true",
+                        help="parse every row and filter afterwards, instead of while reading")
+    parser.add_argument("--enriched-output", default="data/enriched_sales_data.txt",
+                        help="where to save the enriched transactions")
+    parser.add_argument("--report-output", default="output/sales_report.txt",
+                        help="where to save the report (.json for JSON)")
+    parser.add_argument("--cube-output", default=None,
+                        help="also save a region x date x product x customer sales cube here (default: off)")
+    parser.add_argument("--from-cube", default=None,
+                        help="analyze from a cube saved by --cube-output for the same inputs and filters, "
+                             "if there is one (default: off)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parser processes per input file (default: 1)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help=f"parsed-data cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse the inputs")
+    parser.add_argument("--api-url", default=API_BASE_URL,
+                        help=f"product API base URL (default: {API_BASE_URL})")
+    parser.add_argument("--api-concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"catalog pages fetched at once (default: {MAX_CONCURRENCY})")
+    parser.add_argument("--api-rate-limit", type=float, default=RATE_LIMIT,
+                        help=f"maximum API requests per second, 0 for no limit (default: {RATE_LIMIT:g})")
+    parser.add_argument("--match-by", choices=MATCH_MODES, default="id",
+                        help="join sales to the catalog by ProductID number or fuzzy ProductName (default: id)")
+    parser.add_argument("--refresh-enrichment", action="store_true",
+                        help="forget stored product enrichments and resolve every product again")
+    parser.add_argument("--no-enrichment-store", action="store_true",
+                        help="do not remember product enrichments between runs")
+    parser.add_argument("--no-prefetch", action="store_true",
+                        help="fetch the product catalog at step 6 instead of while the files are read")
+    parser.add_argument("--catalog-ttl", type=float, default=CATALOG_TTL,
+                        help=f"seconds a cached product catalog is used without revalidating (default: {CATALOG_TTL})")
+    parser.add_argument("--refresh-catalog", action="store_true",
+                        help="revalidate the cached product catalog now, ignoring its TTL")
+    parser.add_argument("--offline", action="store_true",
+                        help="never call the API; use the cached product catalog only")
+    parser.add_argument("--batch", action="store_true",
+                        help="never prompt for filters, even on a terminal")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage time, rows and peak memory")
+    parser.add_argument("--stage-retries", type=int, default=0,
+                        help="extra attempts for a failing pipeline stage (default: 0)")
+    parser.add_argument("--stage-workers", type=int, default=4,
+                        help="pipeline stages run at once (default: 4)")
+    parser.add_argument("--profile-json", default=None,
+                        help="append per-stage measurements to this JSON file")
 
-    try:
-        # --------------------------------------------------
-        # 1. Read sales data
-        # --------------------------------------------------
-        print("\n[1/10] Reading sales data...")     ## Step info
-        sales_data = ("data/sales_data.txt")       ## Input file path
-        raw_lines = file_handler.read_sales_data(sales_data, encodings)    ## Read raw data lines
-        print(f"Successfully read {len(sales_data)} transactions")    ## Confirmation
-    
+    return parser.parse_args(argv)
 
-        # --------------------------------------------------
-        # 2. Parse & clean data
-        # --------------------------------------------------
-        print("\n[2/10] Parsing and cleaning data...")  
-        cleaned_data = file_handler.parse_transactions(raw_lines)  ## Parse transactions
-        print(f" Parsed {len(cleaned_data)} records")      ## Confirmation
-        
 
-        # --------------------------------------------------
-        # 3. Show filter options
-        # --------------------------------------------------
-        print("\n[3/10] Filter Options Available:")
-        regions = sorted(set(txn["Region"]         ## Extract unique regions
-                         for txn in cleaned_data if txn["Region"]))       ## Non-empty regions
-        amounts = [txn["TotalAmount"] for txn in cleaned_data]     ## Extract amounts
+def read_inputs(paths, encoding, workers, cache_dir, predicate=None):
+    """
+    Reads and parses every input file into one TransactionTable
+
+    One worker parses through mmap in-process; more use the process pool.
+    With a RowPredicate the filter is pushed down into parsing, unless a
+    fresh cached parse exists (loading it beats re-parsing; validate then
+    applies the filter). Partial parses are not cached.
+    """
+    table = TransactionTable()
+    single = workers is not None and workers <= 1
+    full_parse = parser_key("mmap" if single else "parallel")   ## Worker count does not change the parsed rows
+
+    def parse(name, enc, predicate=None):
+        if single:
+            return parse_file_mmap(name, enc, as_table=True, predicate=predicate)
+        return parse_file_parallel(name, enc, workers, as_table=True, predicate=predicate)
+
+    for path in paths:
+        part = load_fresh_cache(path, encoding or encodings, cache_dir, full_parse) if cache_dir and predicate else None
+        if part is None and predicate is not None:
+            part = parse(path, encoding or encodings, predicate)
+        elif part is None and cache_dir:
+            part = load_transactions_cached(path, encoding or encodings, cache_dir, parser=parse, key=full_parse)
+        elif part is None:
+            part = parse(path, encoding or encodings)
+        table.extend(part)
+
+    return table
+
+
+def catalog_options(args):
+    """
+    load_product_catalog() keyword arguments from the command-line options
+    """
+    return {
+        "base_url": args.api_url,
+        "cache_file": os.path.join(args.cache_dir, "product_catalog.json"),
+        "ttl": 0 if args.refresh_catalog else args.catalog_ttl,
+        "offline": args.offline,
+        "max_concurrency": args.api_concurrency,
+        "rate_limit": args.api_rate_limit
+    }
+
+
+def input_fingerprints(paths):
+    """
+    Size and mtime of every input file, so cached stages notice edits
+    """
+    fingerprints = []
+    for path in paths:
+        try:
+            fingerprints.append(file_fingerprint(path, with_hash=False))
+        except OSError:
+            fingerprints.append(None)       ## Missing file: read_sales_data reports it
+    return fingerprints
+
+
+def prompt_filters():
+    """
+    Asks for filters interactively
 
+    Returns: tuple (region, min_amount, max_amount)
+    """
+    apply_filter = input(
+        "\nDo you want to filter data? (y/n): ").strip().lower()    ## User input for filtering
+
+    region = None     ## Initialize filter variables
+    min_amt = None
+    max_amt = None
+
+    if apply_filter == "y":     ## If user wants to filter
+        region = input("Enter region (or press Enter to skip): ").strip() or None    ## Region filter input
+        min_amt = input(
+            "Enter minimum amount (or press Enter to skip): ").strip()  ## Min amount filter input
         try:
-            amounts = [txn["Quantity"] * txn["UnitPrice"]    ## Calculate amounts
-                       for txn in cleaned_data]
-        except Exception:
-            pass
-
-        print(f"Regions: {', '.join(regions)}" if regions else "Regions: None")   ## Display regions
-        if amounts:
-            print(f"Amount Range: ₹{min(amounts):,} - ₹{max(amounts):,}")   ## Display amount range
-        else:
-            print("Amount Range: None")     ## No amounts available
-
-        apply_filter = input(
-            "\nDo you want to filter data? (y/n): ").strip().lower()    ## User input for filtering
-
-        region = None     ## Initialize filter variables
-        min_amt = None    
-        max_amt = None
-
-        if apply_filter == "y":     ## If user wants to filter
-            region = input("Enter region (or press Enter to skip): ").strip()    ## Region filter input
-            min_amt = input(
-                "Enter minimum amount (or press Enter to skip): ").strip()  ## Min amount filter input
-            try:
-                min_amt = float(min_amt) if min_amt else None     ## Convert to float
-            except ValueError:
-                print("Invalid minimum amount. Skipping this filter.")    ## Handle invalid input
-
-            max_amt = input(
-                "Enter maximum amount (or press Enter to skip): ").strip() ## Max amount filter input
-            try:
-                max_amt = float(max_amt) if max_amt else None
-            except ValueError:
-                print("Invalid maximum amount. Skipping this filter.") 
-               
+            min_amt = float(min_amt) if min_amt else None     ## Convert to float
+        except ValueError:
+            min_amt = None
+            print("Invalid minimum amount. Skipping this filter.")    ## Handle invalid input
 
-        # --------------------------------------------------
-        # 4. Validate transactions
-        # --------------------------------------------------
-        print("\n[4/10] Validating transactions...")
-        valid_txns, invalid_txn = validate_and_filter(cleaned_data)   ## Validate & filter data
-        print(f" Valid: {len(valid_txns)} | Invalid: {len(invalid_txn)}")
+        max_amt = input(
+            "Enter maximum amount (or press Enter to skip): ").strip() ## Max amount filter input
+        try:
+            max_amt = float(max_amt) if max_amt else None
+        except ValueError:
+            max_amt = None
+            print("Invalid maximum amount. Skipping this filter.")
 
-        # --------------------------------------------------
-        # 5. Analysis
-        # --------------------------------------------------
-        print("\n[5/10] Analyzing sales data...")
-        analysis_results = customer_analysis(valid_txns)    ### Perform customer analysis
-        print(" Analysis complete")
+    return region, min_amt, max_amt
 
-        # --------------------------------------------------
-        # 6. Fetch product data
-        # --------------------------------------------------
-        print("\n[6/10] Fetching product data from API...")
-        product_data = fetch_all_products()    ## Fetch product data from API
+
+# --------------------------------------------------
+# Pipeline stages (see build_pipeline for how they connect)
+# --------------------------------------------------
+def read_stage(paths, encoding, workers, parse_cache_dir, pushdown):
+    transactions = read_inputs(paths, encoding, workers, parse_cache_dir, pushdown)    ## Read (or load cached) data
+    print(f"Successfully read {len(paths)} file(s)")    ## Confirmation
+    return transactions
+
+
+def parse_stage(transactions):
+    print(f" Parsed {len(transactions)} records")      ## Parsed while reading
+
+
+def filter_stage(transactions, cli_filters, can_prompt):
+    regions = sorted(set(region         ## Extract unique regions
+                     for region in transactions["Region"].values if region))       ## Non-empty regions
+    amounts = transactions.amounts()     ## Extract amounts
+
+    print(f"Regions: {', '.join(regions)}" if regions else "Regions: None")   ## Display regions
+    if amounts:
+        print(f"Amount Range: ₹{min(amounts):,} - ₹{max(amounts):,}")   ## Display amount range
+    else:
+        print("Amount Range: None")     ## No amounts available
+
+    filters_given = any(value is not None for value in cli_filters)
+    if can_prompt and not filters_given:     ## Only prompt a human
+        return prompt_filters()
+    return cli_filters
+
+
+def validate_stage(transactions, filters, pushdown):
+    region, min_amt, max_amt = filters
+    dropped = pushdown.filtered_by_region + pushdown.filtered_by_amount if pushdown is not None else 0
+    if dropped:
+        print(f" {dropped} rows outside the filters were dropped while reading; "
+              "the regions, range and counts below cover the rows that were read")
+    valid_txns, filter_summary = validate_and_filter(
+        transactions, region, min_amt, max_amt)   ## Validate & filter data
+    if pushdown is not None:
+        pushdown.add_to_summary(filter_summary)      ## Rows already dropped while reading
+    print(f" Valid: {len(valid_txns)} | Invalid: {filter_summary['invalid']}")
+    return valid_txns, filter_summary
+
+
+def cube_source(paths, filters):
+    """
+    What a saved cube was built from; load_sales_cube only accepts a match
+    """
+    return {"inputs": input_fingerprints(paths), "filters": list(filters)}
+
+
+def analyze_stage(valid_txns, filters, paths, cube_input):
+    cube = load_sales_cube(cube_input, cube_source(paths, filters)) if cube_input else None
+    if cube is not None:
+        print(f" Rolling up the saved cube ({len(cube)} cells): {cube_input}")
+        analysis_results = aggregate_sales(cube)
+    else:
+        if cube_input:
+            print(f" No saved cube for these inputs and filters at {cube_input}, analyzing the rows")
+        analysis_results = aggregate_sales(valid_txns)    ### Single pass over all metrics, reused by the report
+    print(" Analysis complete")
+    return analysis_results
+
+
+def fetch_stage(catalog_options, store, prefetch):
+    """
+    Loads the catalog up front, in parallel with reading, when it will be needed
+
+    With stored enrichments the products are usually all known already, so
+    the decision is left to the enrich stage (returns None).
+    """
+    if not prefetch or (store is not None and len(store)):
+        print(" Deferred until the products to enrich are known")
+        return None
+
+    product_data = load_product_catalog(**catalog_options)   ## Cached catalog, revalidated with the API when stale
+    print(f" Fetched {len(product_data)} products")
+    return product_data
+
+
+def enrich_stage(valid_txns, product_data, catalog_options, store, match_by):
+    keys = distinct_enrichment_keys(valid_txns, match_by)
+    unseen = store.missing(keys) if store is not None else keys
+
+    if not unseen:
+        print(f" All {len(keys)} products already enriched, catalog not needed")
+        product_data = []       ## Every product was resolved in an earlier run
+    elif product_data is None:
+        product_data = load_product_catalog(**catalog_options)
         print(f" Fetched {len(product_data)} products")
+    if unseen and not product_data:
+        print(" Warning: No product catalog available, new products will not be enriched")
 
-        # --------------------------------------------------
-        # 7. Enrich data
-        # --------------------------------------------------
-        print("\n[7/10] Enriching sales data...")
-        enriched_data = enrich_sales_data(valid_txns, product_data)      ## Enrich sales data
-        success_rate = (len(enriched_data) / len(valid_txns)) * 100      ## Calculate success rate
-        print(
-            f" Enriched {len(enriched_data)}/{len(valid_txns)} transactions ({success_rate:.1f}%)") ## Display result
+    enriched_data = enrich_sales_data(
+        valid_txns, create_product_mapping(product_data), match_by, store)      ## Unseen products only hit the catalog
+    if store is not None:
+        store.save()
 
-        # --------------------------------------------------
-        # 8. Save enriched data
-        # --------------------------------------------------
-        print("\n[8/10] Saving enriched data...")
-        save_enriched_data(enriched_data, "data/enriched_sales_data.txt")   ## Save enriched data
-        print(" Saved to: data/enriched_sales_data.txt")
+    matched = enrichment_summary(enriched_data)["enriched_count"]    ## Column scan, no row dicts
+    success_rate = (matched / len(valid_txns)) * 100 if len(valid_txns) else 0      ## Calculate success rate
+    print(
+        f" Enriched {matched}/{len(valid_txns)} transactions ({success_rate:.1f}%)") ## Display result
+    return enriched_data
+
+
+def save_stage(enriched_data, enriched_output):
+    save_enriched_data(enriched_data, enriched_output)   ## Save enriched data
+    print(f" Saved to: {enriched_output}")
 
-        # --------------------------------------------------
-        # 9. Generate report
-        # --------------------------------------------------
-        print("\n[9/10] Generating report...")
-        generate_sales_report(
-            analysis_results, enriched_data, "output/sales_report.txt")    ## Generate sales report
-        print(" Report saved to: output/sales_report.txt")
+
+def report_stage(analysis_results, enriched_data, report_output):
+    generate_sales_report(
+        analysis_results, enriched_data, report_output)    ## Render from precomputed aggregates
+    print(f" Report saved to: {report_output}")
+
+
+def cube_stage(valid_txns, filters, paths, cube_output):
+    if not cube_output:         ## Opt-in: the report does not need it
+        return
+    cube = build_sales_cube(valid_txns)
+    cube.save(cube_output, cube_source(paths, filters))
+    print(f" Sales cube ({len(cube)} cells) saved to: {cube_output}")
+
+
+def build_pipeline(retries=0):
+    """
+    Declares the pipeline graph
+
+    fetch only needs the options, so it runs alongside read..analyze;
+    save and report both only need enrich/analyze, so they run together;
+    the optional cube is built alongside analyze, and a later run can
+    analyze from it (--from-cube).
+    validate and analyze are pure and cached between runs.
+    """
+    return [
+        Stage("read", read_stage, ["paths", "encoding", "workers", "parse_cache_dir", "pushdown"], ["transactions"],
+              title="Reading sales data...", fingerprint=lambda paths, **_: input_fingerprints(paths),
+              retries=retries),
+        Stage("parse", parse_stage, ["transactions"], [], title="Parsing and cleaning data..."),
+        Stage("filters", filter_stage, ["transactions", "cli_filters", "can_prompt"], ["filters"],
+              title="Filter Options Available:", interactive=True, volatile=True,
+              rows_out=lambda filters: None),
+        Stage("validate", validate_stage, ["transactions", "filters", "pushdown"], ["valid_txns", "filter_summary"],
+              title="Validating transactions...", cache=True, retries=retries, rows_in="transactions"),
+        Stage("analyze", analyze_stage, ["valid_txns", "filters", "paths", "cube_input"], ["analysis_results"],
+              title="Analyzing sales data...", cache=True, retries=retries, rows_in="valid_txns",
+              rows_out=lambda aggregates: aggregates.transaction_count),
+        Stage("fetch", fetch_stage, ["catalog_options", "store", "prefetch"], ["product_data"],
+              title="Fetching product data from API...", volatile=True, retries=retries),
+        Stage("enrich", enrich_stage, ["valid_txns", "product_data", "catalog_options", "store", "match_by"],
+              ["enriched_data"], title="Enriching sales data...", retries=retries, rows_in="valid_txns"),
+        Stage("save", save_stage, ["enriched_data", "enriched_output"], [],
+              title="Saving enriched data...", retries=retries, rows_in="enriched_data"),
+        Stage("report", report_stage, ["analysis_results", "enriched_data", "report_output"], [],
+              title="Generating report...", retries=retries, rows_in="enriched_data"),
+        Stage("cube", cube_stage, ["valid_txns", "filters", "paths", "cube_output"], [],
+              retries=retries)
+    ]
+
+
+def main(argv=None):
+    """
+    Main execution function for Sales Analytics System
+
+    Returns: process exit code (0 on success)
+    """
+    args = parse_args(argv)
+    profiler = PipelineProfiler(enabled=args.profile or bool(args.profile_json))
+
+    print("=" * 30)           ## Header
+    print("SALES ANALYTICS SYSTEM")       ## Title
+
+    try:
+        store = None
+        if not args.no_enrichment_store:
+            store = EnrichmentStore(os.path.join(args.cache_dir, "enrichment_store.json"),
+                                    args.api_url, args.match_by)
+            if args.refresh_enrichment:
+                store.clear()
+
+        # Filters given on the command line are known before reading: push them down
+        cli_filters = (args.region, args.min_amount, args.max_amount)
+        pushdown = RowPredicate(*cli_filters) if not args.no_pushdown else None
+        if pushdown is not None and not pushdown.active:
+            pushdown = None
+
+        cache_dir = None if args.no_cache else args.cache_dir
+        pipeline = Pipeline(build_pipeline(args.stage_retries), cache_dir=cache_dir,
+                            workers=args.stage_workers, profiler=profiler, step_count=10)
+        pipeline.run({
+            "paths": args.inputs,
+            "encoding": args.encoding,
+            "workers": args.workers,
+            "parse_cache_dir": cache_dir,
+            "cli_filters": cli_filters,
+            "pushdown": pushdown,
+            "can_prompt": not args.batch and sys.stdin.isatty(),
+            "catalog_options": catalog_options(args),
+            "prefetch": not args.no_prefetch,
+            "store": store,
+            "match_by": args.match_by,
+            "enriched_output": args.enriched_output,
+            "report_output": args.report_output,
+            "cube_output": args.cube_output,
+            "cube_input": args.from_cube
+        })
 
         # --------------------------------------------------
         # 10. Completion
@@ -120,7 +388,23 @@ def main():
         print("\n[10/10] Process Complete!")
         print("=" * 30)       ## Footer
 
+        if args.profile:
+            print()
+            profiler.print_table()
+        if args.profile_json:
+            profiler.write_json(args.profile_json, metadata={"argv": sys.argv[1:] if argv is None else argv})
+            print(f"Profile appended to: {args.profile_json}")
+        return 0
+
     except Exception as e:
         print("\n ERROR OCCURRED")   ## Error header
         print("Reason:", str(e))     ## Display error reason
-        print("Please check your data or function implementations.")   ## Error handling message
\ No newline at end of file
+        print("Please check your data or function implementations.")   ## Error handling message
+        return 1
+
+    finally:
+        profiler.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+#Full And Partial Aggregation Agree
+import pytest
+
+from benchmarks.generate_sales_data import generate_sales_file
+from utils.data_processor import (SALES_GROUPS, aggregate_sales, calculate_total_revenue, customer_analysis,
+                                  daily_sales_trend, find_peak_sales_day, low_performing_products,
+                                  region_wise_sales, top_selling_products)
+from utils.file_handler import parse_transactions, read_sales_data
+
+VIEWS = [calculate_total_revenue, region_wise_sales, top_selling_products, customer_analysis,
+         daily_sales_trend, find_peak_sales_day, low_performing_products]
+
+
+@pytest.fixture(scope="module")
+def rows(tmp_path_factory):
+    path = tmp_path_factory.mktemp("aggregates") / "sales.txt"
+    generate_sales_file(str(path), 3000, seed=11)
+    return parse_transactions(read_sales_data(str(path)))      ## Unvalidated: dirty rows included
+
+
+def test_partial_groups_match_the_full_pass(rows):
+    full = aggregate_sales(rows)
+    for name in SALES_GROUPS:
+        partial = aggregate_sales(rows, groups=(name,))
+        assert getattr(partial, name) == getattr(full, name)
+        assert partial.transaction_count == full.transaction_count
+        assert partial.total_revenue == full.total_revenue
+
+
+@pytest.mark.parametrize("view", VIEWS, ids=lambda view: view.__name__)
+def test_views_on_rows_match_views_on_aggregates(rows, view):
+    assert view(rows) == view(aggregate_sales(rows))
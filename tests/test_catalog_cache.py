@@ -0,0 +1,36 @@
+#Catalog Cache Keeps Serving The Last Good Snapshot
+import utils.catalog_cache as catalog_cache
+from utils.catalog_cache import load_product_catalog, read_catalog_snapshot, write_catalog_snapshot
+
+BASE_URL = "http://catalog.invalid"
+PRODUCTS = [{"id": 101, "title": "Laptop", "category": "laptops", "brand": "b", "rating": 4.5}]
+
+
+def stale_snapshot(cache_file):
+    write_catalog_snapshot({"base_url": BASE_URL, "fetched_at": 0, "etag": None,
+                            "last_modified": None, "products": PRODUCTS}, cache_file)
+
+
+def test_empty_revalidation_serves_the_snapshot(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "catalog.json")
+    stale_snapshot(cache_file)
+    monkeypatch.setattr(catalog_cache, "_revalidate_or_fetch",
+                        lambda snapshot, *args: {"base_url": BASE_URL, "fetched_at": 1, "products": []})
+    messages = []
+
+    products = load_product_catalog(BASE_URL, cache_file, ttl=60, log=lambda *parts: messages.append(parts))
+
+    assert products == PRODUCTS
+    assert read_catalog_snapshot(cache_file)["products"] == PRODUCTS     ## Not overwritten
+    assert any("no products" in part for parts in messages for part in parts)
+
+
+def test_new_catalog_replaces_the_snapshot(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "catalog.json")
+    stale_snapshot(cache_file)
+    fresh = [dict(PRODUCTS[0], rating=3.0)]
+    monkeypatch.setattr(catalog_cache, "_revalidate_or_fetch",
+                        lambda snapshot, *args: {"base_url": BASE_URL, "fetched_at": 1, "products": fresh})
+
+    assert load_product_catalog(BASE_URL, cache_file, ttl=60, log=lambda *parts: None) == fresh
+    assert read_catalog_snapshot(cache_file)["products"] == fresh
@@ -0,0 +1,184 @@
+#Concurrent Catalog Fetch Against A Local Stand-In Server
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import utils.http_client as http_client
+from utils.api_handler import fetch_all_products, fetch_all_products_async, run_coroutine
+from utils.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+CATALOG_SIZE = 250
+SERVER_PAGE_CAP = 30        ## Like DummyJSON's own cap, smaller, so there are many pages
+RESPONSE_DELAY = 0.02       ## Seconds per request, so concurrent requests overlap
+
+PRODUCTS = [{"id": i, "title": f"Product {i}", "category": "c", "brand": "b", "rating": 4.0}
+            for i in range(1, CATALOG_SIZE + 1)]
+
+
+class StandInServer:
+    """
+    Catalog server with scripted failures
+
+    failures: skip -> how many requests for that page fail with 503 first
+    fail_all: every request fails with 500
+    """
+
+    def __init__(self):
+        self.failures = {}
+        self.fail_all = False
+        self.requests = []          ## skip of every request, in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                skip = int(query.get("skip", [0])[0])
+                limit = min(int(query.get("limit", [SERVER_PAGE_CAP])[0]), SERVER_PAGE_CAP)
+
+                with server.lock:
+                    server.requests.append(skip)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    status = 500 if server.fail_all else 200
+                    if status == 200 and server.failures.get(skip):
+                        server.failures[skip] -= 1
+                        status = 503
+
+                time.sleep(RESPONSE_DELAY)
+                body = b"{}" if status != 200 else json.dumps({
+                    "products": PRODUCTS[skip:skip + limit], "total": CATALOG_SIZE,
+                    "skip": skip, "limit": limit}).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server.lock:
+                    server.in_flight -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "backoff_delay", lambda attempt: 0.01)
+
+
+def sequential_fetch(base_url):
+    """
+    Reference result: one page after another, no retries or concurrency
+    """
+    products, skip = [], 0
+    while True:
+        page = requests.get(f"{base_url}/products", params={"limit": 100, "skip": skip}, timeout=5).json()
+        products.extend(page["products"])
+        skip += len(page["products"])
+        if not page["products"] or skip >= page["total"]:
+            return products
+
+
+def test_concurrent_fetch_retries_and_matches_sequential(server):
+    expected = sequential_fetch(server.url)
+    server.requests.clear()
+    server.max_in_flight = 0
+    server.failures = {60: 2, 150: 1}
+
+    products = run_coroutine(fetch_all_products_async(server.url, max_concurrency=4, rate_limit=0))
+
+    assert products == expected == PRODUCTS
+    assert server.requests.count(60) == 3            ## Two 503s, then the page
+    assert server.requests.count(150) == 2
+    assert 1 < server.max_in_flight <= 4             ## Concurrent, within the bound
+
+
+def test_circuit_breaker_opens_and_recovers(server):
+    server.fail_all = True
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    client = HttpClient(server.url, retries=10, rate_limit=0, breaker=breaker)
+
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{server.url}/products")
+    assert len(server.requests) == 3                 ## Stopped at the threshold, not after 11 attempts
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{server.url}/products")
+    assert len(server.requests) == 3                 ## Open: fails fast without calling the server
+
+    server.fail_all = False
+    breaker.opened_at -= breaker.reset_timeout       ## Time passes: one trial call is allowed
+    assert breaker.state == "half-open"
+    assert client.get(f"{server.url}/products").status_code == 200
+    assert breaker.state == "closed"
+    client.close()
+
+
+def test_unexpected_error_in_half_open_trial_reopens(server, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = HttpClient(server.url, retries=0, rate_limit=0, breaker=breaker)
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout       ## Half-open: the next call is the trial
+
+    def broken_get(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    working_get = client.session.get
+    monkeypatch.setattr(client.session, "get", broken_get)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get(f"{server.url}/products")
+    assert not breaker.trial_running and breaker.state == "open"
+
+    monkeypatch.setattr(client.session, "get", working_get)
+    breaker.opened_at -= breaker.reset_timeout       ## A later trial is allowed again and succeeds
+    assert client.get(f"{server.url}/products").status_code == 200
+    assert breaker.state == "closed"
+    client.close()
+
+
+def test_fetch_all_products_gives_up_cleanly(server, capsys):
+    server.fail_all = True
+
+    assert fetch_all_products(server.url, rate_limit=0) == []
+    assert "Status Code: 500" in capsys.readouterr().out
+    assert len(server.requests) == 1 + http_client.MAX_RETRIES
+
+
+def test_rate_limit_spaces_requests(server):
+    rate = 10
+    client = HttpClient(server.url, rate_limit=rate, breaker=CircuitBreaker())
+
+    started = time.monotonic()
+    for _ in range(rate + 5):                       ## A full bucket, then 5 paced requests
+        client.get(f"{server.url}/products", params={"limit": 1})
+    elapsed = time.monotonic() - started
+    client.close()
+
+    assert elapsed >= 5 / rate * 0.9
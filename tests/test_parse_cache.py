@@ -0,0 +1,60 @@
+#Parse Cache Keys Separate Parsers, Options And Cache Versions
+import pytest
+
+import utils.parse_cache as parse_cache
+from benchmarks.generate_sales_data import generate_sales_file
+from utils.mmap_reader import parse_file_mmap
+from utils.parse_cache import load_fresh_cache, load_transactions_cached, parser_key
+
+
+@pytest.fixture
+def sales_file(tmp_path):
+    path = tmp_path / "sales.txt"
+    generate_sales_file(str(path), 200, seed=3)
+    return str(path)
+
+
+def counting_parser(calls, rows=None):
+    """
+    parse_file_mmap, keeping only the first rows when given (a parser with different output)
+    """
+    def parse(name, enc):
+        calls.append(name)
+        table = parse_file_mmap(name, enc, as_table=True)
+        return table if rows is None else table.take(range(rows))
+    return parse
+
+
+def test_parsers_do_not_share_a_cached_result(sales_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+
+    full = load_transactions_cached(sales_file, cache_dir=cache_dir)
+    head = load_transactions_cached(sales_file, cache_dir=cache_dir, parser=counting_parser(calls, 10),
+                                    key=parser_key("head", rows=10))
+    assert len(calls) == 1 and len(head) == 10 < len(full)
+
+    again = load_transactions_cached(sales_file, cache_dir=cache_dir, parser=counting_parser(calls, 10),
+                                     key=parser_key("head", rows=10))
+    assert len(calls) == 1 and len(again) == 10          ## Served from its own cache entry
+    assert len(load_fresh_cache(sales_file, cache_dir=cache_dir)) == len(full)
+    assert load_fresh_cache(sales_file, cache_dir=cache_dir, key=parser_key("parallel")) is None
+
+
+def test_custom_parser_needs_a_key(sales_file, tmp_path):
+    with pytest.raises(ValueError):
+        load_transactions_cached(sales_file, cache_dir=str(tmp_path), parser=counting_parser([]))
+
+
+def test_parser_key_is_order_independent():
+    assert parser_key("plain", a=1, b="x") == parser_key("plain", b="x", a=1)
+    assert parser_key("plain", a=1) != parser_key("plain", a=2) != parser_key("plain")
+
+
+def test_cache_version_bump_invalidates(sales_file, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    load_transactions_cached(sales_file, cache_dir=cache_dir)
+    assert load_fresh_cache(sales_file, cache_dir=cache_dir) is not None
+
+    monkeypatch.setattr(parse_cache, "CACHE_VERSION", parse_cache.CACHE_VERSION + 1)
+    assert load_fresh_cache(sales_file, cache_dir=cache_dir) is None
@@ -0,0 +1,78 @@
+#Predicate Pushdown Must Not Change The Filter Summary
+import contextlib
+import io
+
+import pytest
+
+from benchmarks.generate_sales_data import generate_sales_file
+from utils.file_handler import RowPredicate, parse_transactions, read_sales_data, validate_and_filter
+from utils.mmap_reader import parse_file_mmap
+from utils.parallel_reader import parse_file_parallel
+
+FILTERS = [
+    ("North", None, None),
+    ("South", 1000, None),
+    (None, 500, 20000),
+    ("East", None, 3000),
+    ("Nowhere", None, None)
+]
+
+
+@pytest.fixture(scope="module")
+def sales_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pushdown") / "sales.txt"
+    generate_sales_file(str(path), 5000, seed=7)       ## Includes malformed and invalid rows
+    return str(path)
+
+
+def _validate(transactions, filters, predicate=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        valid, summary = validate_and_filter(transactions, *filters)
+    if predicate is not None:
+        predicate.add_to_summary(summary)
+    return [txn["TransactionID"] for txn in valid], summary
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("as_table", [False, True])
+def test_parse_pushdown_matches_plain_run(sales_file, filters, as_table):
+    lines = read_sales_data(sales_file)
+    expected = _validate(parse_transactions(lines, as_table=as_table), filters)
+
+    predicate = RowPredicate(*filters)
+    pushed = _validate(parse_transactions(lines, as_table=as_table, predicate=predicate), filters, predicate)
+
+    assert pushed == expected
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_read_pushdown_matches_plain_run(sales_file, filters):
+    expected = _validate(parse_transactions(read_sales_data(sales_file), as_table=True), filters)
+
+    predicate = RowPredicate(*filters)
+    lines = read_sales_data(sales_file, predicate=predicate)
+    pushed = _validate(parse_transactions(lines, as_table=True), filters, predicate)
+
+    assert pushed == expected
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+def test_parallel_pushdown_matches_plain_run(sales_file, filters):
+    expected = _validate(parse_transactions(read_sales_data(sales_file), as_table=True), filters)
+
+    predicate = RowPredicate(*filters)
+    table = parse_file_parallel(sales_file, "utf-8", 2, as_table=True, predicate=predicate)
+    pushed = _validate(table, filters, predicate)
+
+    assert pushed == expected
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_mmap_pushdown_matches_plain_run(sales_file, filters):
+    expected = _validate(parse_transactions(read_sales_data(sales_file), as_table=True), filters)
+
+    predicate = RowPredicate(*filters)
+    table = parse_file_mmap(sales_file, "utf-8", as_table=True, predicate=predicate)
+    pushed = _validate(table, filters, predicate)
+
+    assert pushed == expected
@@ -0,0 +1,330 @@
+#Fetch Product Details from API
+import asyncio
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.http_client import RATE_LIMIT, CircuitOpenError, HttpClient
+from utils.product_matcher import ProductNameIndex
+from utils.transaction_table import DictionaryColumn, TransactionTable
+
+API_BASE_URL = "https://dummyjson.com"
+PAGE_SIZE = 100             ## Products per request (DummyJSON returns at most 100)
+MAX_CONCURRENCY = 8         ## Pages in flight at once
+REQUEST_TIMEOUT = 10        ## Seconds per request
+
+
+async def _fetch_page(client, semaphore, url, skip, limit):
+    """
+    Fetches one page of the catalog
+
+    The blocking call (with its retries) runs in a worker thread; the
+    semaphore bounds how many pages are in flight.
+    """
+    async with semaphore:
+        response = await asyncio.to_thread(client.get, url, params={"limit": limit, "skip": skip})
+        response.raise_for_status()
+        return response.json()
+
+
+async def fetch_all_products_async(base_url=API_BASE_URL, page_size=PAGE_SIZE,
+                                   max_concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT,
+                                   client=None, first_page=None, rate_limit=RATE_LIMIT):
+    """
+    Fetches every page of the product catalog concurrently
+
+    The first page tells us the catalog's total size; the remaining pages
+    are then requested together, at most max_concurrency at a time.
+    Pass first_page (the decoded JSON) if it has already been fetched, and
+    client (a utils.http_client.HttpClient) to reuse its session.
+
+    Returns: list of product dictionaries, in catalog order
+    """
+    own_client = client is None
+    if own_client:
+        client = HttpClient(base_url, max_concurrency, timeout, rate_limit=rate_limit)
+
+    url = f"{base_url.rstrip('/')}/products"
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    try:
+        if first_page is None:
+            first_page = await _fetch_page(client, semaphore, url, 0, page_size)
+        products = list(first_page.get("products", []))
+        total = first_page.get("total", len(products))
+
+        # The server may cap the page size, so step by what it actually sent
+        step = len(products)
+
+        # Remaining pages, fetched concurrently; gather keeps them in order
+        pages = await asyncio.gather(*(
+            _fetch_page(client, semaphore, url, skip, step)
+            for skip in range(step, total, step)
+        )) if step else []
+
+        for page in pages:
+            products.extend(page.get("products", []))
+
+        return products
+
+    finally:
+        if own_client:
+            client.close()
+
+
+def run_coroutine(coroutine):
+    """
+    Runs a coroutine to completion, even if an event loop is already running
+    (e.g. inside a Jupyter notebook)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def fetch_all_products(base_url=API_BASE_URL, page_size=PAGE_SIZE,
+                       max_concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT, rate_limit=RATE_LIMIT):
+    """
+    Fetches all products from DummyJSON API
+
+    Every page is fetched (see fetch_all_products_async), not just the
+    first 100 products. Transient failures are retried with backoff; an
+    upstream that keeps failing trips the circuit breaker (utils.http_client).
+
+    Returns: list of product dictionaries
+    """
+
+    import requests
+
+    try:
+        products = run_coroutine(fetch_all_products_async(
+            base_url, page_size, max_concurrency, timeout, rate_limit=rate_limit))
+        print(" Products fetched successfully")
+
+    except requests.exceptions.HTTPError as e:
+        print(" Failed to fetch products | Status Code:",
+              e.response.status_code if e.response is not None else "unknown")  # Log failure
+        return []
+
+    except (requests.exceptions.RequestException, CircuitOpenError, ValueError) as e:
+        #  Handle connection-related errors
+        print(" API connection failed:", e)
+        return []  # Return empty list on failure
+
+    #  Return product list
+    return products
+
+
+#Product Mapping
+def create_product_mapping(api_products):
+    """
+    Creates a mapping of product IDs to product info
+
+    Parameters: api_products from fetch_all_products()
+
+    Returns: dictionary mapping product IDs to info
+    """
+
+    #  Initialize empty mapping dictionary
+    product_mapping = {}
+
+    #  Iterate through API product list
+    for product in api_products:
+        try:
+            product_id = product.get("id")
+            if product_id is None:
+                continue
+
+            #   Extract required product fields
+            product_mapping[product_id] = {
+                "title": product.get("title"),
+                "category": product.get("category"),
+                "brand": product.get("brand"),
+                "rating": product.get("rating")
+            }
+
+        except (AttributeError, TypeError):
+            continue
+
+    #  Return final product mapping
+    return product_mapping
+
+
+#Enrichment of Sales Data
+ENRICHMENT_FIELDS = ["API_Category", "API_Brand", "API_Rating", "API_Match"]
+NAME_MATCH_FIELDS = ["API_Title", "API_MatchScore"]      ## Added when matching by name
+MATCH_MODES = ("id", "name")
+ENRICHMENT_KEYS = {"id": "ProductID", "name": "ProductName"}     ## Column each mode joins on
+
+
+def product_id_to_api_id(product_id):
+    """
+    Extracts the numeric API id from a ProductID (e.g., P101 -> 101)
+
+    Returns: int, or None if the ProductID has no digits
+    """
+    if isinstance(product_id, str):
+        numeric_part = "".join(filter(str.isdigit, product_id))
+        if numeric_part:
+            return int(numeric_part)
+    return None
+
+
+def _api_fields(api_product):
+    if api_product is None:
+        return {"API_Category": None, "API_Brand": None, "API_Rating": None, "API_Match": False}
+    return {
+        "API_Category": api_product.get("category"),
+        "API_Brand": api_product.get("brand"),
+        "API_Rating": api_product.get("rating"),
+        "API_Match": True
+    }
+
+
+def product_enrichment(product_id, product_mapping):
+    """
+    Returns the API_* fields for one ProductID
+    """
+    return _api_fields(product_mapping.get(product_id_to_api_id(product_id)))
+
+
+def name_enrichment(product_name, name_index, product_mapping):
+    """
+    Returns the API_* fields for the catalog title closest to a ProductName
+
+    name_index is a utils.product_matcher.ProductNameIndex over the mapping
+    """
+    key, title, score = name_index.match(product_name)
+    fields = _api_fields(product_mapping.get(key) if key is not None else None)
+    fields["API_Title"] = title
+    fields["API_MatchScore"] = round(score, 3)
+    return fields
+
+
+def _enricher(product_mapping, match_by, store=None):
+    """
+    Returns (key column, function computing the API_* fields for one key)
+
+    With a store, keys it already holds are answered from it and newly
+    resolved keys are added to it (unless the catalog is empty, so a failed
+    fetch is not remembered as "no match").
+    """
+    if match_by == "id":
+        enrich = lambda product_id: product_enrichment(product_id, product_mapping)
+    elif match_by == "name":
+        name_index = ProductNameIndex.from_mapping(product_mapping)     ## Built once per call
+        enrich = lambda name: name_enrichment(name, name_index, product_mapping)
+    else:
+        raise ValueError(f"Unknown match mode {match_by!r}, expected one of {MATCH_MODES}")
+
+    if store is None:
+        return ENRICHMENT_KEYS[match_by], enrich
+
+    def enrich_with_store(key):
+        fields = store.get(key)
+        if fields is None:
+            fields = enrich(key)
+            if product_mapping:
+                store.add(key, fields)
+        return fields
+
+    return ENRICHMENT_KEYS[match_by], enrich_with_store
+
+
+def distinct_enrichment_keys(transactions, match_by="id"):
+    """
+    Returns the set of ProductIDs (or ProductNames) the transactions use
+
+    Used to check an EnrichmentStore before deciding to fetch the catalog.
+    """
+    key_column = ENRICHMENT_KEYS[match_by]
+    if isinstance(transactions, TransactionTable):
+        column = transactions[key_column]
+        values = column.values
+        return {values[code] for code in set(column.codes)}    ## The dictionary may hold filtered-out values
+    return {txn.get(key_column, "") for txn in transactions}
+
+
+def build_enrichment_index(keys, product_mapping, match_by="id", store=None):
+    """
+    Precomputes the enrichment of every distinct ProductID (or ProductName)
+
+    There are only a few dozen products, so the id parsing, name matching
+    and mapping lookups happen once per product instead of once per
+    transaction. store is used as in enrich_sales_data().
+
+    Returns: dictionary mapping each key to its API_* fields
+    """
+    enrich = _enricher(product_mapping, match_by, store)[1]
+    return {key: enrich(key) for key in set(keys)}
+
+
+def _enrich_table(table, product_mapping, match_by, store):
+    """
+    Enriches a TransactionTable by gathering through its key column's codes
+
+    Each API_* column is a DictionaryColumn whose dictionary is the
+    enrichment of each ProductID (or ProductName) value and whose codes are
+    a copy of that column's codes, so no per-row work beyond one array copy
+    is done.
+    """
+    keys = table[ENRICHMENT_KEYS[match_by]]
+    index = build_enrichment_index(distinct_enrichment_keys(table, match_by), product_mapping, match_by, store)
+    empty = _api_fields(None)
+
+    fields = ENRICHMENT_FIELDS + (NAME_MATCH_FIELDS if match_by == "name" else [])
+    enriched = table.copy()
+    for field in fields:
+        column = DictionaryColumn([index.get(value, empty).get(field) for value in keys.values])
+        column.codes = array('i', keys.codes)
+        enriched.add_column(field, column)
+    return enriched
+
+
+def enrich_sales_data(transactions, product_mapping, match_by="id", store=None):
+    """
+    Enriches transaction data with API product information
+
+    match_by="id" maps ProductID P101 to API id 101; match_by="name" finds
+    the closest catalog title to each ProductName (see
+    utils.product_matcher) and adds API_Title and API_MatchScore.
+
+    With store (a utils.enrichment_store.EnrichmentStore), products resolved
+    in earlier runs are taken from it and only unseen ones use the catalog;
+    the caller saves the store.
+
+    Saving is left to file_handler.save_enriched_data()
+
+    Only table input avoids per-row copies (the API_* columns share the key
+    column's codes). A list of dicts gets one new merged dict per row, so
+    the caller's dicts are left untouched.
+
+    Returns: a TransactionTable with API_* columns for table input,
+    otherwise a list of enriched transaction dictionaries
+    """
+
+    if isinstance(transactions, TransactionTable):
+        return _enrich_table(transactions, product_mapping, match_by, store)
+
+    key_column, enrich = _enricher(product_mapping, match_by, store)
+    enriched_transactions = []
+    index = {}      ## ProductID/ProductName -> API_* fields, filled on first sight
+
+    #  Process each transaction
+    for txn in transactions:
+        try:
+            key = txn.get(key_column, "")
+            fields = index.get(key)
+            if fields is None:
+                fields = index[key] = enrich(key)
+
+            enriched_transactions.append(txn | fields)     ## One merged copy instead of copy + 4 writes
+
+        except Exception:
+            continue
+
+    #  Return enriched transaction list
+    return enriched_transactions
@@ -0,0 +1,203 @@
+#Bitmap Index over a TransactionTable
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:         ## Optional: bitmaps are then built and scanned in pure Python
+    np = None
+
+from utils.file_handler import new_filter_summary, valid_table_positions
+from utils.table_index import SortedIndex, group_positions
+
+BITMAP_COLUMNS = ('Region', 'ProductName', 'ProductID', 'Date')
+
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def bitmap_from_positions(positions, size):
+    """
+    Builds a bitmap (Python int, bit i = row i) from row positions
+    """
+    if np is not None:
+        mask = np.zeros(size, dtype=bool)
+        mask[np.asarray(positions, dtype=np.int64)] = True
+        return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+    bits = bytearray((size + 7) // 8)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def bitmap_positions(bitmap):
+    """
+    Row positions of the set bits, in row order
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    if np is not None:
+        return np.flatnonzero(np.unpackbits(np.frombuffer(data, dtype=np.uint8),
+                                            bitorder='little')).tolist()
+
+    positions = []
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index << 3
+            positions.extend(base + bit for bit in _BYTE_BITS[byte])
+    return positions
+
+
+class BitmapIndex:
+    """
+    One bitmap per distinct value of the low-cardinality columns
+
+    Bitmaps are Python ints (bit i = row i), so combining conditions is a
+    handful of C-level & / | operations over n/8 bytes, and counts are
+    popcounts: filter summaries need no row positions at all. Only the
+    valid rows are set, so validation runs once, when the index is built.
+
+    Bitmaps are stored uncompressed; with a few dozen distinct values per
+    column they cost a few bytes per row in total.
+    """
+
+    def __init__(self, table, columns=BITMAP_COLUMNS):
+        self.table = table
+        self.size = len(table)
+        valid = valid_table_positions(table)
+        self.valid = bitmap_from_positions(valid, self.size)
+        self.valid_count = len(valid)
+
+        self.bitmaps = {name: {value: bitmap_from_positions(positions, self.size)
+                               for value, positions in group_positions(table[name], valid).items()}
+                        for name in columns}
+        self.by_amount = SortedIndex.for_amounts(table.amounts(), valid)    ## Same amount index as TableIndex
+
+        self.dates = sorted(self.bitmaps['Date'], key=str) if 'Date' in self.bitmaps else []
+        self.date_keys = [str(date) for date in self.dates]
+
+    def __len__(self):
+        return self.valid_count
+
+    # ---------------- Bitmaps ----------------
+    def bitmap(self, name, value):
+        """
+        Bitmap of the valid rows whose `name` column equals value
+
+        value may also be a list/tuple/set, meaning any of those values.
+        """
+        bitmaps = self.bitmaps[name]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            result = 0
+            for v in value:
+                result |= bitmaps.get(v, 0)
+            return result
+        return bitmaps.get(value, 0)
+
+    def values(self, name):
+        """
+        Distinct values of an indexed column among the valid rows
+        """
+        return sorted(self.bitmaps[name])
+
+    def date_bitmap(self, start=None, end=None):
+        """
+        Bitmap of the valid rows with start <= Date <= end
+        """
+        lo = 0 if start is None else bisect_left(self.date_keys, start)
+        hi = len(self.date_keys) if end is None else bisect_right(self.date_keys, end)
+        dates = self.bitmaps['Date']
+        result = 0
+        for date in self.dates[lo:hi]:
+            result |= dates[date]
+        return result
+
+    def amount_bitmap(self, min_amount=None, max_amount=None):
+        """
+        Bitmap of the valid rows with min_amount <= Quantity * UnitPrice <= max_amount
+        """
+        positions = self.by_amount.range(min_amount, max_amount)
+        if len(positions) == self.valid_count:
+            return self.valid
+        return bitmap_from_positions(positions, self.size)
+
+    def select(self, region=None, product_id=None, product_name=None,
+               start_date=None, end_date=None, min_amount=None, max_amount=None):
+        """
+        Bitmap of the valid rows matching every given condition
+        """
+        result = self.valid
+        for name, value in (('Region', region), ('ProductID', product_id), ('ProductName', product_name)):
+            if value is not None:
+                result &= self.bitmap(name, value)
+        if start_date is not None or end_date is not None:
+            result &= self.date_bitmap(start_date, end_date)
+        if result and (min_amount is not None or max_amount is not None):
+            result &= self.amount_bitmap(min_amount, max_amount)
+        return result
+
+    def count(self, **conditions):
+        """
+        Number of valid rows matching select(**conditions), without materializing them
+        """
+        return self.select(**conditions).bit_count()
+
+    def rows(self, **conditions):
+        """
+        Returns: TransactionTable of the rows matching select(**conditions)
+        """
+        return self.table.take(bitmap_positions(self.select(**conditions)))
+
+    # ---------------- validate_and_filter ----------------
+    def _filter(self, region=None, min_amount=None, max_amount=None):
+        filter_summary = new_filter_summary()
+        filter_summary['total_input'] = self.size
+        filter_summary['invalid'] = self.size - self.valid_count
+
+        selected, count = self.valid, self.valid_count
+
+        # Region Filter
+        if region:
+            selected &= self.bitmap('Region', region)
+            filter_summary['filtered_by_region'] = count - selected.bit_count()
+            count = selected.bit_count()
+
+        # Amount Filter
+        if min_amount is not None or max_amount is not None:
+            if selected:
+                selected &= self.amount_bitmap(min_amount, max_amount)
+            filter_summary['filtered_by_amount'] = count - selected.bit_count()
+
+        filter_summary['final_count'] = selected.bit_count()
+        return selected, filter_summary
+
+    def filter_summary(self, region=None, min_amount=None, max_amount=None):
+        """
+        filter_summary validate_and_filter would return, from popcounts alone
+        """
+        return self._filter(region, min_amount, max_amount)[1]
+
+    def validate_and_filter(self, region=None, min_amount=None, max_amount=None):
+        """
+        Same output, prints and filter_summary as validate_and_filter on the
+        indexed table, answered by intersecting bitmaps
+
+        Returns: (filtered TransactionTable, filter_summary)
+        """
+        # ---------------- Display Regions ----------------
+        print("Available Regions:", self.values('Region'))
+
+        # ---------------- Display Amount Range ----------------
+        bounds = self.by_amount.bounds()
+        if self.valid_count and bounds is not None:
+            print(f"Transaction Amount Range: Min={bounds[0]}, Max={bounds[1]}")
+        else:
+            print("Transaction Amount Range: No valid transactions")
+
+        # ---------------- Filtering ----------------
+        selected, filter_summary = self._filter(region, min_amount, max_amount)
+        if region:
+            print("Records after region filter:",
+                  filter_summary['final_count'] + filter_summary['filtered_by_amount'])
+        if min_amount is not None or max_amount is not None:
+            print("Records after amount filter:", filter_summary['final_count'])
+
+        return self.table.take(bitmap_positions(selected)), filter_summary
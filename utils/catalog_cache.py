@@ -0,0 +1,140 @@
+#Persistent Product Catalog Cache
+import json
+import os
+import time
+from email.utils import formatdate
+
+from utils.api_handler import (API_BASE_URL, MAX_CONCURRENCY, PAGE_SIZE, REQUEST_TIMEOUT,
+                               fetch_all_products_async, run_coroutine)
+from utils.http_client import RATE_LIMIT, CircuitOpenError, HttpClient
+
+CATALOG_CACHE_FILE = os.path.join(".cache", "product_catalog.json")
+CATALOG_TTL = 24 * 60 * 60      ## Seconds a snapshot is served without asking the API
+
+
+def read_catalog_snapshot(cache_file=CATALOG_CACHE_FILE):
+    """
+    Loads the last saved catalog snapshot
+
+    Returns: snapshot dictionary, or None if there is no usable snapshot
+    """
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(snapshot, dict) or not isinstance(snapshot.get("products"), list):
+        return None
+    return snapshot
+
+
+def write_catalog_snapshot(snapshot, cache_file=CATALOG_CACHE_FILE):
+    """
+    Saves a catalog snapshot atomically
+    """
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    temp_file = cache_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(temp_file, cache_file)
+
+
+def _conditional_headers(snapshot):
+    """
+    Builds If-None-Match / If-Modified-Since headers from a snapshot
+    """
+    headers = {}
+    if snapshot.get("etag"):
+        headers["If-None-Match"] = snapshot["etag"]
+    if snapshot.get("last_modified"):
+        headers["If-Modified-Since"] = snapshot["last_modified"]
+    elif snapshot.get("fetched_at"):
+        headers["If-Modified-Since"] = formatdate(snapshot["fetched_at"], usegmt=True)
+    return headers
+
+
+def _revalidate_or_fetch(snapshot, base_url, max_concurrency, timeout, rate_limit, log):
+    """
+    Asks the API whether the catalog changed, fetching it only if it did
+
+    The first page is requested with the snapshot's validators; a 304 means
+    the cached catalog is still current and no further pages are fetched.
+
+    Returns: new snapshot dictionary
+    """
+    with HttpClient(base_url, max_concurrency, timeout, rate_limit=rate_limit) as client:
+        response = client.get(
+            f"{base_url.rstrip('/')}/products",
+            params={"limit": PAGE_SIZE, "skip": 0},
+            headers=_conditional_headers(snapshot) if snapshot else {}
+        )
+
+        if response.status_code == 304 and snapshot:
+            snapshot = dict(snapshot, fetched_at=time.time())
+            log(" Product catalog unchanged (304), using cached copy")
+            return snapshot
+
+        response.raise_for_status()
+        products = run_coroutine(fetch_all_products_async(
+            base_url, PAGE_SIZE, max_concurrency, timeout, client=client, first_page=response.json()))
+
+        log(" Products fetched successfully")
+        return {
+            "base_url": base_url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "products": products
+        }
+
+
+def load_product_catalog(base_url=API_BASE_URL, cache_file=CATALOG_CACHE_FILE, ttl=CATALOG_TTL,
+                         offline=False, max_concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT,
+                         rate_limit=RATE_LIMIT, log=print):
+    """
+    Returns the product catalog, going to the network only when needed
+
+    - a snapshot younger than ttl seconds is returned straight from disk
+    - an older one is revalidated with ETag / Last-Modified (304 = reuse it)
+    - offline=True, or any network failure, serves the last good snapshot
+
+    Progress messages go through log (print by default), so a caller running
+    this in a background thread can show them later.
+
+    Returns: list of product dictionaries (same shape as fetch_all_products)
+    """
+    import requests
+
+    snapshot = read_catalog_snapshot(cache_file)
+    if snapshot and snapshot.get("base_url") != base_url:
+        snapshot = None                 ## Snapshot of a different API
+
+    if offline:
+        if snapshot is None:
+            log(" Offline and no cached product catalog available")
+            return []
+        log(" Offline: using cached product catalog")
+        return snapshot["products"]
+
+    age = time.time() - snapshot.get("fetched_at", 0) if snapshot else None
+    if snapshot and age < ttl:
+        log(f" Using cached product catalog ({age / 60:.0f} min old)")
+        return snapshot["products"]
+
+    try:
+        fresh = _revalidate_or_fetch(snapshot, base_url, max_concurrency, timeout, rate_limit, log)
+
+    except (requests.exceptions.RequestException, CircuitOpenError, ValueError) as e:
+        log(" API connection failed:", e)
+        if snapshot:
+            log(" Falling back to the last cached product catalog")
+            return snapshot["products"]
+        return []
+
+    if not fresh["products"] and snapshot:     ## Never replace a good snapshot with an empty one
+        log(" API returned no products, using the last cached product catalog")
+        return snapshot["products"]
+    if fresh["products"]:
+        write_catalog_snapshot(fresh, cache_file)
+    return fresh["products"]
@@ -1,15 +1,176 @@
-#Calculate Total Revenue
-def calculate_total_revenue(transactions):
+from utils.transaction_table import TransactionTable
+
+SALES_GROUPS = ("regions", "products", "customers", "daily")
+
+
+#Single-Pass Sales Aggregation
+class SalesAggregates:
     """
-    Calculates total revenue from all transactions
+    Every per-group total the analysis functions need, gathered in one pass
 
-    Returns: float (total revenue)
+    Build it once with aggregate_sales() and hand it to any of the analysis
+    functions below in place of the transaction list; they then only shape
+    the already-summed groups instead of re-scanning every row.
+    """
 
-    Expected Output: Single number representing sum of (Quantity * UnitPrice)
-    Example: 1545000.50
+    def __init__(self):
+        self.transaction_count = 0      ## Rows with valid numeric data
+        self.total_revenue = 0.0
+        self.regions = {}       ## region -> {"total_sales", "transaction_count"}
+        self.products = {}      ## product -> {"quantity", "revenue"}
+        self.customers = {}     ## customer -> {"total_spent", "purchase_count", "products_bought"}
+        self.daily = {}         ## date -> {"revenue", "transaction_count", "unique_customers"}
+
+    def add(self, region, product, customer_id, date, quantity, amount):
+        """
+        Folds one transaction into every group
+        """
+        self.transaction_count += 1
+        self.total_revenue += amount
+        self.add_region(region, amount)
+        self.add_product(product, quantity, amount)
+        if customer_id:
+            self.add_customer(customer_id, product, amount)
+        if date:
+            self.add_day(date, customer_id, amount)
+
+    def add_region(self, region, amount):
+        region_entry = self.regions.get(region)
+        if region_entry is None:
+            region_entry = self.regions[region] = {"total_sales": 0.0, "transaction_count": 0}
+        region_entry["total_sales"] += amount
+        region_entry["transaction_count"] += 1
+
+    def add_product(self, product, quantity, amount):
+        product_entry = self.products.get(product)
+        if product_entry is None:
+            product_entry = self.products[product] = {"quantity": 0, "revenue": 0.0}
+        product_entry["quantity"] += quantity
+        product_entry["revenue"] += amount
+
+    def add_customer(self, customer_id, product, amount):
+        customer_entry = self.customers.get(customer_id)
+        if customer_entry is None:
+            customer_entry = self.customers[customer_id] = {
+                "total_spent": 0.0, "purchase_count": 0, "products_bought": set()}
+        customer_entry["total_spent"] += amount
+        customer_entry["purchase_count"] += 1
+        customer_entry["products_bought"].add(product)
+
+    def add_day(self, date, customer_id, amount):
+        day_entry = self.daily.get(date)
+        if day_entry is None:
+            day_entry = self.daily[date] = {
+                "revenue": 0.0, "transaction_count": 0, "unique_customers": set()}
+        day_entry["revenue"] += amount
+        day_entry["transaction_count"] += 1
+        if customer_id:
+            day_entry["unique_customers"].add(customer_id)
+
+    def merge(self, other):
+        """
+        Folds another SalesAggregates (e.g. from a different file chunk) into this one
+        """
+        self.transaction_count += other.transaction_count
+        self.total_revenue += other.total_revenue
+
+        for groups, other_groups in ((self.regions, other.regions), (self.products, other.products),
+                                     (self.customers, other.customers), (self.daily, other.daily)):
+            for key, other_entry in other_groups.items():
+                entry = groups.get(key)
+                if entry is None:
+                    entry = groups[key] = {
+                        field: set() if isinstance(value, set) else 0
+                        for field, value in other_entry.items()}
+                for field, value in other_entry.items():
+                    if isinstance(value, set):
+                        entry[field] |= value
+                    else:
+                        entry[field] += value
+        return self
+
+
+def _aggregate_table(table):
     """
-    total_revenue = 0.0        ## Initialize total revenue
+    Fused group-by over a TransactionTable
+
+    Groups are keyed on dictionary codes inside the loop and only decoded
+    to strings once per group at the end.
+    """
+    aggregates = SalesAggregates()
+    regions, products, customers, daily = {}, {}, {}, {}
+    total_revenue = 0.0
+
+    rows = zip(table['Region'].codes, table['ProductName'].codes, table['CustomerID'].codes,
+               table['Date'].codes, table.quantities, table.unit_prices)
+
+    for region, product, customer, date, quantity, unit_price in rows:
+        amount = quantity * unit_price      ## Computed once for every metric
+        total_revenue += amount
+
+        entry = regions.get(region)
+        if entry is None:
+            entry = regions[region] = [0.0, 0]
+        entry[0] += amount
+        entry[1] += 1
+
+        entry = products.get(product)
+        if entry is None:
+            entry = products[product] = [0, 0.0]
+        entry[0] += quantity
+        entry[1] += amount
+
+        entry = customers.get(customer)
+        if entry is None:
+            entry = customers[customer] = [0.0, 0, set()]
+        entry[0] += amount
+        entry[1] += 1
+        entry[2].add(product)
+
+        entry = daily.get(date)
+        if entry is None:
+            entry = daily[date] = [0.0, 0, set()]
+        entry[0] += amount
+        entry[1] += 1
+        entry[2].add(customer)
+
+    # Decode group keys back to their string values
+    region_values = table['Region'].values
+    product_values = table['ProductName'].values
+    customer_values = table['CustomerID'].values
+    date_values = table['Date'].values
+
+    aggregates.transaction_count = len(table)
+    aggregates.total_revenue = total_revenue
+    aggregates.regions = {
+        region_values[code]: {"total_sales": sales, "transaction_count": count}
+        for code, (sales, count) in regions.items()}
+    aggregates.products = {
+        product_values[code]: {"quantity": quantity, "revenue": revenue}
+        for code, (quantity, revenue) in products.items()}
+    aggregates.customers = {
+        customer_values[code]: {
+            "total_spent": spent,
+            "purchase_count": count,
+            "products_bought": {product_values[p] for p in bought}}
+        for code, (spent, count, bought) in customers.items() if customer_values[code]}
+    aggregates.daily = {
+        date_values[code]: {
+            "revenue": revenue,
+            "transaction_count": count,
+            "unique_customers": {customer_values[c] for c in seen if customer_values[c]}}
+        for code, (revenue, count, seen) in daily.items() if date_values[code]}
+    return aggregates
+
+
+def iter_sales_amounts(transactions):
+    """
+    Cleans each transaction dictionary down to the fields the aggregations use
+
+    Rows with invalid numeric data are skipped.
 
+    Returns: generator of (region, product, customer_id, date, quantity, amount)
+    """
     for txn in transactions:
         try:
             quantity = float(txn.get("Quantity", 0))        ## Get quantity
@@ -19,14 +180,97 @@ def calculate_total_revenue(transactions):
             if isinstance(unit_price, str):
                 unit_price = unit_price.replace(",", "")      ## Clean commas
 
-            unit_price = float(unit_price)        ## Convert to float
-            total_revenue += quantity * unit_price    ## Accumulate revenue
+            amount = quantity * float(unit_price)     ## Converted once per row
 
         except (ValueError, TypeError, AttributeError):
             # Skip rows with invalid numeric data
             continue
 
-    return round(total_revenue, 2)     ## Return rounded total revenue to 2 decimal places
+        yield (
+            txn.get("Region", "Unknown"),
+            txn.get("ProductName", "Unknown"),
+            txn.get("CustomerID"),
+            txn.get("Date"),
+            quantity,
+            amount
+        )
+
+
+def _aggregate_groups(transactions, groups):
+    """
+    Single pass over transaction dictionaries that fills only some groups
+
+    The analysis functions use it when handed raw rows, so a standalone
+    calculate_total_revenue(rows) does not pay for per-customer and
+    per-day sets it never reads.
+    """
+    aggregates = SalesAggregates()
+    regions, products = "regions" in groups, "products" in groups
+    customers, daily = "customers" in groups, "daily" in groups
+    total_revenue = 0.0
+    count = 0
+
+    for region, product, customer_id, date, quantity, amount in iter_sales_amounts(transactions):
+        count += 1
+        total_revenue += amount
+        if regions:
+            aggregates.add_region(region, amount)
+        if products:
+            aggregates.add_product(product, quantity, amount)
+        if customers and customer_id:
+            aggregates.add_customer(customer_id, product, amount)
+        if daily and date:
+            aggregates.add_day(date, customer_id, amount)
+
+    aggregates.transaction_count = count
+    aggregates.total_revenue = total_revenue
+    return aggregates
+
+
+def aggregate_sales(transactions, groups=None):
+    """
+    Computes every sales metric in a single pass over the transactions
+
+    A SalesCube is rolled up instead, without touching any rows.
+
+    groups: names from SALES_GROUPS to fill when transactions is a list of
+    dictionaries (default: all); totals are always computed
+
+    Returns: SalesAggregates (pass it to any analysis function below)
+    """
+    from utils.sales_cube import SalesCube     ## Imported here: sales_cube builds on this module
+
+    if isinstance(transactions, SalesAggregates):
+        return transactions
+    if isinstance(transactions, SalesCube):
+        return transactions.to_aggregates()
+    if isinstance(transactions, TransactionTable):
+        return _aggregate_table(transactions)
+
+    if groups is not None and set(groups) != set(SALES_GROUPS):
+        return _aggregate_groups(transactions, groups)
+
+    aggregates = SalesAggregates()
+
+    for row in iter_sales_amounts(transactions):
+        aggregates.add(*row)
+
+    return aggregates
+
+
+#Calculate Total Revenue
+def calculate_total_revenue(transactions):
+    """
+    Calculates total revenue from all transactions
+
+    Returns: float (total revenue)
+
+    Expected Output: Single number representing sum of (Quantity * UnitPrice)
+    Example: 1545000.50
+    """
+    aggregates = aggregate_sales(transactions, groups=())
+
+    return round(aggregates.total_revenue, 2)     ## Return rounded total revenue to 2 decimal places
 
 
 #Region-Wise Sales Analysis
@@ -53,34 +297,15 @@ def region_wise_sales(transactions):
     - Calculate percentage of total sales
     - Sort by total_sales in descending order
     """
-    region_data = {}         ## Initialize storage for region data
-    overall_sales = 0.0      ## Initialize overall sales
-
-    # First pass: calculate total sales and transaction count per region
-    for transaction in transactions:
-        try:
-            region = transaction.get("Region", "Unknown")        ## Get region
-            quantity = float(transaction.get("Quantity", 0))     ## Get quantity
-            unit_price = transaction.get("UnitPrice", 0)         ## Get unit price
-
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")
-
-            unit_price = float(unit_price)        ## Convert to float
-            sale_amount = quantity * unit_price   ## Calculate sale amount
+    aggregates = aggregate_sales(transactions, groups=("regions",))
+    overall_sales = aggregates.total_revenue      ## Overall sales
 
-            if region not in region_data:         ## Initialize region entry
-                region_data[region] = {
-                    "total_sales": 0.0,
-                    "transaction_count": 0
-                }
-
-            region_data[region]["total_sales"] += sale_amount       ## Update total sales
-            region_data[region]["transaction_count"] += 1           ## Update transaction count
-            overall_sales += sale_amount                            ## Update overall sales
-
-        except (ValueError, TypeError):
-            continue
+    region_data = {}         ## Copy so the shared aggregates stay untouched
+    for region, data in aggregates.regions.items():
+        region_data[region] = {
+            "total_sales": data["total_sales"],
+            "transaction_count": data["transaction_count"]
+        }
 
     # Calculate percentage contribution
     for region in region_data:
@@ -124,42 +349,7 @@ def top_selling_products(transactions, n=5):
     - Sort by TotalQuantity descending
     - Return top n products
     """
-
-    # Dictionary to store aggregated product data
-    # Format:
-    # {
-    #   'Laptop': {'quantity': 10, 'revenue': 500000.0},
-    #   'Mouse': {'quantity': 25, 'revenue': 12000.0}
-    # }
-    product_summary = {}            ## Initialize product summary
-
-    # Looping through each transaction
-    for txn in transactions:
-        try:
-            product_name = txn.get("ProductName", "Unknown")
-            quantity = float(txn.get("Quantity", 0))        ## Convert to float
-            unit_price = txn.get("UnitPrice", 0)
-            # Remove commas from price (e.g., "1,916")
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")     ## Clean commas
-
-            unit_price = float(unit_price)      ## Convert to float
-            revenue = quantity * unit_price     ## Calculate revenue
-
-            # Initialize product if not already present
-            if product_name not in product_summary:      ## Create new entry
-                product_summary[product_name] = {
-                    "quantity": 0,
-                    "revenue": 0.0
-                }
-
-            # Aggregate quantity and revenue
-            product_summary[product_name]["quantity"] += quantity        ## Update quantity
-            product_summary[product_name]["revenue"] += revenue      ## Update revenue
-
-        except (ValueError, TypeError):
-            # Skip invalid rows
-            continue
+    product_summary = aggregate_sales(transactions, groups=("products",)).products
 
     #  Convert dictionary to list of tuples
     product_list = []                       ## Initialize product list
@@ -181,49 +371,18 @@ def customer_analysis(transactions):
 
     Returns: dictionary of customer statistics
     """
-
-    # Initialize storage for customer data
-    customers = {}     
-
-    # Process each transaction
-    for txn in transactions:
-        try:
-            customer_id = txn.get("CustomerID")
-            if not customer_id:
-                continue
-
-            quantity = float(txn.get("Quantity", 0))        ## Convert to float
-            unit_price = txn.get("UnitPrice", 0)     ## Get unit price
-
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")
-
-            unit_price = float(unit_price)
-            amount = quantity * unit_price
-            product = txn.get("ProductName", "Unknown")
-
-            # 3. Create customer entry if not exists
-            if customer_id not in customers:      ## Create new entry
-                customers[customer_id] = {
-                    "total_spent": 0.0,
-                    "purchase_count": 0,
-                    "products_bought": set()
-                }
-
-            # Update customer data
-            customers[customer_id]["total_spent"] += amount     ## Update total spent
-            customers[customer_id]["purchase_count"] += 1       ## Update purchase count
-            customers[customer_id]["products_bought"].add(product)    ## Add product to set
-
-        except (ValueError, TypeError):
-            continue
+    customers = {}
 
     # Calculate average order value
-    for customer in customers.values():      ## Iterate through customers
-        customer["avg_order_value"] = round(                          
-            customer["total_spent"] / customer["purchase_count"], 2     ## Calculate average order value
-        )
-        customer["products_bought"] = list(customer["products_bought"])     ## Convert set to list
+    for customer_id, data in aggregate_sales(transactions, groups=("customers",)).customers.items():      ## Iterate through customers
+        customers[customer_id] = {
+            "total_spent": data["total_spent"],
+            "purchase_count": data["purchase_count"],
+            "products_bought": list(data["products_bought"]),     ## Convert set to list
+            "avg_order_value": round(
+                data["total_spent"] / data["purchase_count"], 2     ## Calculate average order value
+            )
+        }
 
     # Sort customers by total_spent (descending)
     sorted_customers = dict(
@@ -244,50 +403,15 @@ def daily_sales_trend(transactions):
 
     Returns: dictionary sorted by date
     """
-
-    # Initialize dictionary to store daily data
     daily_data = {}
 
-    # Process each transaction
-    for txn in transactions:
-        try:
-            date = txn.get("Date")    
-            if not date:
-                continue
-
-            quantity = float(txn.get("Quantity", 0))        ## Convert to float
-            unit_price = txn.get("UnitPrice", 0)     ## Get unit price
-
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")
-
-            unit_price = float(unit_price)
-            revenue = quantity * unit_price
-            customer_id = txn.get("CustomerID")
-
-            #  Create date entry if not exists
-            if date not in daily_data:
-                daily_data[date] = {
-                    "revenue": 0.0,
-                    "transaction_count": 0,
-                    "unique_customers": set()
-                }
-
-            # Update daily metrics
-            daily_data[date]["revenue"] += revenue          ## Update revenue
-            daily_data[date]["transaction_count"] += 1      ## Increment transaction count
-
-            if customer_id:
-                daily_data[date]["unique_customers"].add(customer_id)
-
-        except (ValueError, TypeError):
-            continue
-
     #  Finalize unique customer count
-    for date in daily_data:
-        daily_data[date]["unique_customers"] = len(
-            daily_data[date]["unique_customers"]
-        )
+    for date, data in aggregate_sales(transactions, groups=("daily",)).daily.items():
+        daily_data[date] = {
+            "revenue": data["revenue"],
+            "transaction_count": data["transaction_count"],
+            "unique_customers": len(data["unique_customers"])
+        }
 
     # 6. Sort by date (chronological order)
     sorted_daily_data = dict(
@@ -303,39 +427,7 @@ def find_peak_sales_day(transactions):
 
     Returns: tuple (date, revenue, transaction_count)
     """
-
-    # Initialize storage for daily revenue data
-    daily_summary = {}    
-
-    #  Process each transaction
-    for txn in transactions:
-        try:
-            date = txn.get("Date")
-            if not date:
-                continue
-
-            quantity = float(txn.get("Quantity", 0))
-            unit_price = txn.get("UnitPrice", 0)
-
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")
-
-            unit_price = float(unit_price)
-            revenue = quantity * unit_price
-
-            # Create date entry if not exists
-            if date not in daily_summary:
-                daily_summary[date] = {
-                    "revenue": 0.0,
-                    "transaction_count": 0
-                }
-
-            #  Update daily revenue and transaction count
-            daily_summary[date]["revenue"] += revenue
-            daily_summary[date]["transaction_count"] += 1
-
-        except (ValueError, TypeError):
-            continue
+    daily_summary = aggregate_sales(transactions, groups=("daily",)).daily
 
     #  Identify peak sales day
     peak_date = None                 ## Initialize peak date
@@ -357,45 +449,17 @@ def low_performing_products(transactions, threshold=10):
 
     Returns: list of tuples
     """
-
-    # Initialize dictionary to store product-wise data
-    product_data = {}
-
-    #  Process each transaction
-    for txn in transactions:
-        try:
-            product = txn.get("ProductName", "Unknown")
-            quantity = float(txn.get("Quantity", 0))
-            unit_price = txn.get("UnitPrice", 0)
-            if isinstance(unit_price, str):
-                unit_price = unit_price.replace(",", "")
-
-            unit_price = float(unit_price)      ## Convert to float
-            revenue = quantity * unit_price     ## Calculate revenue
-
-            # Create product entry if not exists
-            if product not in product_data:
-                product_data[product] = {
-                    "total_quantity": 0,
-                    "total_revenue": 0.0
-                }
-
-            # Update quantity and revenue
-            product_data[product]["total_quantity"] += quantity
-            product_data[product]["total_revenue"] += revenue
-
-        except (ValueError, TypeError):
-            continue
+    product_data = aggregate_sales(transactions, groups=("products",)).products
 
     # Filter products below threshold
     low_products = []             ## Initialize low products list
     for product, data in product_data.items():
-        if data["total_quantity"] < threshold:
+        if data["quantity"] < threshold:
             low_products.append(
                 (
                     product,
-                    int(data["total_quantity"]),      ## Convert quantity to int
-                    round(data["total_revenue"], 2)    ## Round revenue to 2 decimal places
+                    int(data["quantity"]),      ## Convert quantity to int
+                    round(data["revenue"], 2)    ## Round revenue to 2 decimal places
                 )
             )
 
@@ -403,4 +467,3 @@ def low_performing_products(transactions, threshold=10):
     low_products.sort(key=lambda x: x[1])
 
     return low_products
-
@@ -0,0 +1,76 @@
+#Persistent Enrichment Store
+import json
+import os
+
+ENRICHMENT_STORE_FILE = os.path.join(".cache", "enrichment_store.json")
+STORE_VERSION = 1
+
+
+class EnrichmentStore:
+    """
+    ProductID/ProductName -> API_* fields remembered across runs
+
+    The product set barely changes between runs, so once a product has been
+    resolved against the catalog its fields are reused and only unseen
+    products need the catalog (and the API). Entries are kept per match
+    mode and per catalog URL; a store written for another catalog starts
+    empty.
+    """
+
+    def __init__(self, path=ENRICHMENT_STORE_FILE, source=None, match_by="id"):
+        self.path = path
+        self.source = source
+        self.match_by = match_by
+        self.changed = False
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("version") == STORE_VERSION and stored.get("source") == source:
+                self.data = stored
+            else:
+                self.data = None
+        except (OSError, ValueError, AttributeError):
+            self.data = None
+
+        if self.data is None:
+            self.data = {"version": STORE_VERSION, "source": source, "modes": {}}
+        self.entries = self.data["modes"].setdefault(match_by, {})     ## Key -> API_* fields
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def missing(self, keys):
+        """
+        Returns the keys that have not been resolved yet
+        """
+        return [key for key in keys if key not in self.entries]
+
+    def add(self, key, fields):
+        if not isinstance(key, str):    ## JSON object keys must be strings
+            return
+        self.entries[key] = dict(fields)
+        self.changed = True
+
+    def clear(self):
+        self.entries.clear()
+        self.changed = True
+
+    def save(self):
+        """
+        Writes the store atomically, if anything was added
+        """
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_file = self.path + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(temp_file, self.path)
+        self.changed = False
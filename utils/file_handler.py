@@ -1,115 +1,685 @@
 #Reading Sales Data With Encoding Handling
+import codecs
 import csv
+import os
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:         ## Optional: tables are then validated in pure Python
+    np = None
+
+from utils.transaction_table import TRANSACTION_COLUMNS, TransactionTable
 
 encodings = ['utf-8', 'latin-1', 'utf-16']  ## List of possible encodings
 
+SNIFF_BYTES = 64 * 1024     ## Sample size used to guess the encoding
+
+# Byte order marks, longest first (the UTF-32-LE BOM starts with the UTF-16-LE one)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+]
+
+_detected_encodings = {}    ## (path, size, mtime, candidates) -> encoding
+
+
+def is_ascii_compatible(encoding):
+    """
+    Tells whether b'|' and b'\\n' can be found in the raw bytes of an encoding
+
+    Byte-level readers (chunking, mmap) are only safe when this is True.
+    """
+    name = codecs.lookup(encoding).name
+    return not name.startswith(("utf-16", "utf-32"))
+
+
+#Encoding Detection
+def _sniff_encoding(sample, candidates, complete):
+    """
+    Picks an encoding from a BOM or by trial-decoding a byte sample
+
+    complete: True when the sample is the whole file, so a multi-byte
+    sequence cut off at the end counts as an error
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+
+    # BOM-less UTF-16: ASCII text leaves a NUL in every other byte
+    if sample and sample.count(b'\x00') * 4 >= len(sample):
+        return 'utf-16-le' if sample[1::2].count(b'\x00') > sample[0::2].count(b'\x00') else 'utf-16-be'
 
-def read_sales_data(filename, encodings):
-    data = []  # Initialize an empty list to store the data
+    for encoding in candidates:
+        if not is_ascii_compatible(encoding):       ## Only plausible with a BOM or NULs
+            continue
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=complete)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+
+    return 'latin-1'        ## Decodes any byte sequence
+
+
+def detect_encoding(filename, candidates=None, sample_size=SNIFF_BYTES):
+    """
+    Guesses a file's encoding from its BOM and a bounded sample of bytes
+
+    The answer is remembered per file version (path, size, mtime), so
+    ingesting many files, or the same file twice, sniffs each one only once.
+
+    Returns: encoding name
+    """
+    candidates = tuple(candidates or encodings)
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns, candidates)
+
+    encoding = _detected_encodings.get(key)
+    if encoding is None:
+        with open(filename, 'rb') as f:
+            sample = f.read(sample_size)
+        encoding = _detected_encodings[key] = _sniff_encoding(
+            sample, candidates, complete=len(sample) >= stat.st_size)
+    return encoding
+
+
+def resolve_encoding(filename, encodings=None):
+    """
+    Turns an encoding argument into a single codec name
+
+    A string is used as given; None or a list of candidates is sniffed
+    with detect_encoding().
+    """
+    if isinstance(encodings, str):
+        return encodings
+    return detect_encoding(filename, encodings)
+
+
+#Streaming Sales Data Reader
+def iter_non_empty_rows(reader):
+    """
+    Drops blank rows from a csv reader (or any iterable of field lists)
+    """
+    for row in reader:
+        if row and any(field.strip() for field in row):  # Check for non-empty row
+            yield row
+
+
+def iter_sales_rows(filename, encodings=None):
+    """
+    Lazily reads the sales file one row at a time
+
+    encodings: a codec name, or a list of candidates (default: sniffed)
+
+    Returns: generator of field lists (header and blank rows skipped)
+    """
     try:
+        encoding = resolve_encoding(filename, encodings)     ## Decided once, then a single pass
 
-        with open(filename, mode='r', encoding=encodings, newline='\n', errors='replace') as f:
+        with open(filename, mode='r', encoding=encoding, newline='\n', errors='replace') as f:
             reader = csv.reader(f, delimiter='|')
 
             header = next(reader, None)  # Skip header row
 
-            for row in reader:
-                if row and any(field.strip() for field in row):  # Check for non-empty row
-                    # Clean and store the row
-                    data.append('|'.join(row).strip())
-        return data
+            yield from iter_non_empty_rows(reader)      ## Hand the raw fields on without re-joining
 
     except UnicodeEncodeError:
         print(
             f"Error: Could not decode file {filename} with encoding {encodings}.")
-        return data
     except FileNotFoundError:
         print(f"Error: File {filename} not found.")
-        return data
-    
+
+
+#Predicate Pushdown
+class RowPredicate:
+    """
+    Region / amount filter applied to raw rows while reading or parsing
+
+    Rows outside the filter are dropped before any dict or table row is
+    built; without an amount filter, rows of the wanted region are kept
+    after a plain string compare on the raw field. Dropped rows are
+    counted so validate_and_filter's summary can include them (see
+    add_to_summary).
+
+    Only rows that parsing and validation would keep are ever dropped;
+    malformed or invalid rows are passed on, so they are counted (or
+    skipped) exactly as without pushdown and the summaries match. Rows of
+    another region are checked for that on their raw strings, without the
+    int/float conversions (see _raw_row_is_valid); only an amount filter
+    needs the numbers parsed.
+
+    validate_and_filter only sees the rows that were kept, so its printed
+    regions, amount range and counts describe that subset.
+    """
+
+    def __init__(self, region=None, min_amount=None, max_amount=None):
+        self.region = region or None        ## Same as validate_and_filter: "" means no filter
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.filtered_by_region = 0
+        self.filtered_by_amount = 0
+
+    @property
+    def active(self):
+        return self.region is not None or self.min_amount is not None or self.max_amount is not None
+
+    def rejects(self, fields):
+        """
+        Checks one row's raw fields
+
+        Returns: True if the row fails the filter (and counts it)
+        """
+        if len(fields) != len(TRANSACTION_COLUMNS):
+            return False                    ## Malformed: the parser rejects it
+
+        if self.region is not None and fields[7].strip() != self.region:
+            if not _raw_row_is_valid(fields):
+                return False                ## Left to parsing/validation, which count it as before
+            self.filtered_by_region += 1
+            return True
+        if self.min_amount is None and self.max_amount is None:
+            return False                    ## Kept without converting anything
+
+        values = _parse_fields(fields)
+        return values is not None and self.rejects_values(values)
+
+    def rejects_values(self, values):
+        """
+        Checks one parsed row (a _parse_fields() tuple)
+
+        Returns: True if the row is valid but fails the filter (and counts it)
+        """
+        if not _parsed_row_is_valid(values):
+            return False                    ## Left to validation, which counts it as before
+
+        if self.region is not None and values[7] != self.region:
+            self.filtered_by_region += 1
+            return True
+
+        amount = values[4] * values[5]
+        if (self.min_amount is not None and amount < self.min_amount) or \
+                (self.max_amount is not None and amount > self.max_amount):
+            self.filtered_by_amount += 1
+            return True
+        return False
+
+    def empty_copy(self):
+        """
+        Same filter with zeroed counters (one per parallel chunk)
+        """
+        return RowPredicate(self.region, self.min_amount, self.max_amount)
+
+    def merge(self, other):
+        self.filtered_by_region += other.filtered_by_region
+        self.filtered_by_amount += other.filtered_by_amount
+
+    def add_to_summary(self, filter_summary):
+        """
+        Adds the pushed-down rows to a validate_and_filter summary
+        """
+        dropped = self.filtered_by_region + self.filtered_by_amount
+        filter_summary['total_input'] += dropped
+        filter_summary['filtered_by_region'] += self.filtered_by_region
+        filter_summary['filtered_by_amount'] += self.filtered_by_amount
+        return filter_summary
+
+
+def read_sales_data(filename, encodings=None, predicate=None):
+    """
+    Reads the whole sales file into memory
+
+    predicate: optional RowPredicate; rows it rejects are never kept
+
+    Returns: list of cleaned pipe-delimited lines
+    """
+    rows = iter_sales_rows(filename, encodings)
+    if predicate is not None and predicate.active:
+        rows = (row for row in rows if not predicate.rejects(row))
+    return ['|'.join(row).strip() for row in rows]
+
 #Parsing and cleaning Data
-def parse_transactions(raw_lines):
-    data = []
-    for line in raw_lines:
-        try:
-            transaction_id, date, product_id, product_name, quantity, unit_price, customerID, region = [
-                f.strip() for f in line.split('|')]
+def _parse_fields(fields):
+    """
+    Parses and cleans one row of fields
 
-            # Handle commas within product names
-            cleaned_product_name = product_name.replace(",", " ").strip()
+    Returns: tuple in TRANSACTION_COLUMNS order, or None if the row is
+    malformed or rejected
+    """
+    try:
+        transaction_id, date, product_id, product_name, quantity, unit_price, customerID, region = [
+            f.strip() for f in fields]
 
-            # Remove commas from numeric fields and convert to appropriate types
-            cleaned_unit_price = float(unit_price.replace(',', '').strip())
-            cleaned_quantity = int(quantity.replace(',', '').strip())
+        # Handle commas within product names
+        cleaned_product_name = product_name.replace(",", " ").strip()
 
-            # Validate numeric fields
-            if cleaned_quantity <= 0 or cleaned_unit_price <= 0:     
-                continue
+        # Remove commas from numeric fields and convert to appropriate types
+        cleaned_unit_price = float(unit_price.replace(',', '').strip())
+        cleaned_quantity = int(quantity.replace(',', '').strip())
 
-            # Validate TransactionID format
-            if not transaction_id.startswith('T'):  
-                continue
+        # Validate numeric fields
+        if cleaned_quantity <= 0 or cleaned_unit_price <= 0:
+            return None
 
-            data.append({
-                'TransactionID': transaction_id,
-                'Date': date,
-                'ProductID': product_id,
-                'ProductName': cleaned_product_name,
-                'Quantity': cleaned_quantity,
-                'UnitPrice': cleaned_unit_price,
-                'CustomerID': customerID,
-                'Region': region
-            })
-        except (ValueError, AttributeError):
-            continue  # skip invalid numeric values
-    return data
+        # Validate TransactionID format
+        if not transaction_id.startswith('T'):
+            return None
+
+        return (transaction_id, date, product_id, cleaned_product_name,
+                cleaned_quantity, cleaned_unit_price, customerID, region)
+    except (ValueError, AttributeError):
+        return None  # skip invalid numeric values
+
+
+def iter_transactions(raw_rows, predicate=None):
+    """
+    Lazily parses raw lines (or field lists) into transactions
+
+    predicate: optional RowPredicate applied before parsing
+
+    Returns: generator of transaction dictionaries
+    """
+    if predicate is not None and not predicate.active:
+        predicate = None
+
+    for row in raw_rows:
+        fields = row.split('|') if isinstance(row, str) else row     ## Accept lines or field lists
+        if predicate is not None and predicate.rejects(fields):
+            continue
+        values = _parse_fields(fields)
+        if values is not None:
+            yield dict(zip(TRANSACTION_COLUMNS, values))
+
+
+def parse_transactions(raw_lines, as_table=False, predicate=None):
+    """
+    Parses raw lines into transactions
+
+    predicate: optional RowPredicate; rows it rejects are skipped before
+    any conversion or dict allocation
+
+    Returns: list of dicts, or a TransactionTable when as_table is True
+    """
+    if not as_table:
+        return list(iter_transactions(raw_lines, predicate))
+
+    if predicate is not None and not predicate.active:
+        predicate = None
+
+    table = TransactionTable()
+    for row in raw_lines:
+        fields = row.split('|') if isinstance(row, str) else row
+        if predicate is not None and predicate.rejects(fields):
+            continue
+        values = _parse_fields(fields)
+        if values is not None:
+            table.append_row(*values)      ## No per-row dict is ever built
+    return table
 
 #Data Validation And Filtering
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+REQUIRED_FIELDS = [
+    'TransactionID',
+    'ProductID',
+    'CustomerID',
+    'Region',
+    'Quantity',
+    'UnitPrice'
+]
+
+
+def new_filter_summary():
     """
-    Validates transactions and applies optional filters
- """
+    Creates the counters filled in by the validation/filter generators
+    """
+    return {
+        'total_input': 0,
+        'invalid': 0,
+        'filtered_by_region': 0,
+        'filtered_by_amount': 0,
+        'final_count': 0
+    }
 
-    required_fields = [
-        'TransactionID',
-        'ProductID',
-        'CustomerID',
-        'Region',
-        'Quantity',
-        'UnitPrice'
-    ]
-
-    # ---------------- Initialization ----------------
-    total_input = len(transactions)  
-    invalid_count = 0  
-    valid_transactions = []  
-    # ---------------- Validation ----------------
+
+def _parsed_row_is_valid(values):
+    """
+    iter_valid_transactions' checks on a _parse_fields() tuple
+    """
+    transaction_id, _, product_id, _, quantity, unit_price, customer_id, region = values
+    return (transaction_id.startswith('T') and product_id.startswith('P')
+            and customer_id.startswith('C') and region != ''
+            and quantity > 0 and unit_price > 0)
+
+
+def _is_positive_number(text, convert):
+    """
+    Whether convert(text) (int or float), after the parser's cleaning, is > 0
+
+    Plain digit strings (with one optional '.') are decided without
+    converting; anything else falls back to convert().
+    """
+    text = text.replace(',', '').strip()
+    whole, dot, fraction = text.partition('.')
+    if (whole + fraction).isdecimal() and (not dot or convert is float):
+        return (whole + fraction).strip('0') != ''
+    try:
+        return convert(text) > 0
+    except ValueError:
+        return False
+
+
+def _raw_row_is_valid(fields):
+    """
+    _parse_fields() followed by _parsed_row_is_valid(), on raw strings
+
+    Returns: True if parsing and validation would both keep the row
+    """
+    transaction_id, _, product_id, _, quantity, unit_price, customer_id, region = fields
+    return (transaction_id.strip().startswith('T') and product_id.strip().startswith('P')
+            and customer_id.strip().startswith('C') and region.strip() != ''
+            and _is_positive_number(quantity, int) and _is_positive_number(unit_price, float))
+
+
+def iter_valid_transactions(transactions, summary=None):
+    """
+    Lazily drops transactions that fail validation
+
+    Counts are accumulated into summary (see new_filter_summary)
+    """
+    if summary is None:
+        summary = new_filter_summary()
 
     for txn in transactions:
+        summary['total_input'] += 1
 
         # Check required fields
-        if not all(field in txn and txn[field] not in (None, '') for field in required_fields):
-            invalid_count += 1
+        if not all(field in txn and txn[field] not in (None, '') for field in REQUIRED_FIELDS):
+            summary['invalid'] += 1
             continue
 
         # Validate ID formats
-        
-        if not str (txn['TransactionID']).startswith(('T')):     
-            invalid_count += 1        
+
+        if not str (txn['TransactionID']).startswith(('T')):
+            summary['invalid'] += 1
             continue
         if not str (txn['ProductID']).startswith(('P')):
-            invalid_count += 1        
+            summary['invalid'] += 1
             continue
         if not str (txn['CustomerID']).startswith(('C')):
-            invalid_count += 1        
+            summary['invalid'] += 1
             continue
 
         # Validate Quantity and UnitPrice
         if txn['Quantity'] <= 0 or txn['UnitPrice'] <= 0:
-            invalid_count += 1
+            summary['invalid'] += 1
+            continue
+
+        yield txn
+
+
+def iter_filtered_transactions(transactions, region=None, min_amount=None, max_amount=None, summary=None):
+    """
+    Lazily applies the region and amount filters
+
+    Counts are accumulated into summary (see new_filter_summary)
+    """
+    if summary is None:
+        summary = new_filter_summary()
+
+    check_amount = min_amount is not None or max_amount is not None
+
+    for txn in transactions:
+        # Region Filter
+        if region and txn['Region'] != region:
+            summary['filtered_by_region'] += 1
+            continue
+
+        # Amount Filter
+        if check_amount:
+            amount = txn['Quantity'] * txn['UnitPrice']     ## Computed once per row
+
+            if (min_amount is not None and amount < min_amount) or \
+                    (max_amount is not None and amount > max_amount):
+                summary['filtered_by_amount'] += 1
+                continue
+
+        summary['final_count'] += 1
+        yield txn
+
+
+def stream_sales_data(filename, encodings=None, region=None, min_amount=None, max_amount=None, summary=None):
+    """
+    Lazy read -> parse -> validate -> filter chain over a sales file
+
+    Returns: generator of clean transactions; memory use does not grow
+    with the file, so it can feed the data_processor functions directly
+    """
+    rows = iter_sales_rows(filename, encodings)
+    valid = iter_valid_transactions(iter_transactions(rows), summary)
+    return iter_filtered_transactions(valid, region, min_amount, max_amount, summary)
+
+
+def _table_valid_positions(table):
+    """
+    Row positions of a TransactionTable that pass validation (pure Python)
+
+    ID and required-field checks run once per distinct dictionary value;
+    the per-row work is integer code lookups.
+    """
+    def bad_codes(name, prefix=None):       ## Flags per dictionary code
+        return [value in (None, '') or (prefix is not None and not str(value).startswith(prefix))
+                for value in table[name].values]
+
+    bad_product = bad_codes('ProductID', 'P')
+    bad_customer = bad_codes('CustomerID', 'C')
+    bad_region = bad_codes('Region')
+
+    valid_positions = []
+    rows = zip(table['TransactionID'], table['ProductID'].codes, table['CustomerID'].codes,
+               table['Region'].codes, table.quantities, table.unit_prices)
+
+    for i, (transaction_id, product, customer, region_code, quantity, unit_price) in enumerate(rows):
+        if not transaction_id or not str(transaction_id).startswith('T') \
+                or bad_product[product] or bad_customer[customer] or bad_region[region_code] \
+                or quantity <= 0 or unit_price <= 0:
             continue
+        valid_positions.append(i)
+    return valid_positions
 
-        valid_transactions.append(txn)
+
+def _validate_and_filter_table(table, region=None, min_amount=None, max_amount=None):
+    """
+    Columnar version of validate_and_filter for a TransactionTable
+
+    ID and required-field checks run once per distinct dictionary value;
+    the per-row work is integer code lookups and one amount per row.
+    """
+    filter_summary = new_filter_summary()
+    filter_summary['total_input'] = len(table)
+
+    # ---------------- Validation ----------------
+    valid_positions = _table_valid_positions(table)
+    filter_summary['invalid'] = len(table) - len(valid_positions)
+
+    # ---------------- Display Regions ----------------
+    region_codes = table['Region'].codes
+    region_values = table['Region'].values
+    regions = sorted({region_values[region_codes[i]] for i in valid_positions})
+    print("Available Regions:", regions)
+
+    # ---------------- Display Amount Range ----------------
+    amounts = table.amounts()      ## One multiplication per row, reused below
+
+    if valid_positions:
+        valid_amounts = [amounts[i] for i in valid_positions]
+        print(
+            f"Transaction Amount Range: Min={min(valid_amounts)}, Max={max(valid_amounts)}")
+    else:
+        print("Transaction Amount Range: No valid transactions")
+
+    # ---------------- Filtering ----------------
+    positions = valid_positions
+
+    # Region Filter
+    if region:
+        region_code = table['Region'].lookup.get(region)
+        before = len(positions)
+        positions = [i for i in positions if region_codes[i] == region_code]
+        filter_summary['filtered_by_region'] = before - len(positions)
+        print("Records after region filter:", len(positions))
+
+    # Amount Filter
+    if min_amount is not None or max_amount is not None:
+        before = len(positions)
+        positions = [i for i in positions
+                     if (min_amount is None or amounts[i] >= min_amount)
+                     and (max_amount is None or amounts[i] <= max_amount)]
+        filter_summary['filtered_by_amount'] = before - len(positions)
+        print("Records after amount filter:", len(positions))
+
+    # ---------------- Summary ----------------
+    filter_summary['final_count'] = len(positions)
+
+    return table.take(positions), filter_summary
+
+
+def _column_array(column):
+    """
+    Zero-copy NumPy view of a typed array column (or of a DictionaryColumn's codes)
+    """
+    data = getattr(column, "codes", column)
+    return np.frombuffer(data, dtype=data.typecode)
+
+
+def _id_prefix_mask(ids, prefix):
+    """
+    True where an ID is a non-empty string starting with prefix
+    """
+    try:
+        flags = map(str.startswith, ids, repeat(prefix))      ## C-level loop
+        return np.fromiter(flags, dtype=bool, count=len(ids))
+    except TypeError:       ## Non-string IDs (e.g. None) from hand-built tables
+        return np.fromiter((isinstance(i, str) and i.startswith(prefix) for i in ids),
+                           dtype=bool, count=len(ids))
+
+
+def _table_valid_mask(table):
+    """
+    Boolean NumPy mask of the TransactionTable rows that pass validation
+    """
+    def good_codes(name, prefix=None):      ## Valid flag per row, via its dictionary code
+        flags = np.array([value not in (None, '') and (prefix is None or str(value).startswith(prefix))
+                          for value in table[name].values], dtype=bool)
+        return flags[_column_array(table[name])] if len(flags) else np.zeros(len(table), dtype=bool)
+
+    valid = _id_prefix_mask(table['TransactionID'], 'T')
+    valid &= good_codes('ProductID', 'P')
+    valid &= good_codes('CustomerID', 'C')
+    valid &= good_codes('Region')
+    valid &= ~(_column_array(table.quantities) <= 0)     ## Same comparison as the row check, so NaN behaves alike
+    valid &= ~(_column_array(table.unit_prices) <= 0)
+    return valid
+
+
+def valid_table_positions(table):
+    """
+    Row positions of a TransactionTable that pass validate_and_filter's checks
+
+    Returns: sorted list of ints
+    """
+    if np is not None:
+        return np.flatnonzero(_table_valid_mask(table)).tolist()
+    return _table_valid_positions(table)
+
+
+def _validate_and_filter_numpy(table, region=None, min_amount=None, max_amount=None):
+    """
+    Vectorized version of validate_and_filter for a TransactionTable
+
+    Every rule becomes a boolean mask over the columns (dictionary checks
+    run once per distinct value and are gathered through the codes), the
+    masks are ANDed together and the filters are further mask operations.
+    Amounts are computed once. Prints and filter_summary match the other
+    implementations.
+    """
+    filter_summary = new_filter_summary()
+    filter_summary['total_input'] = len(table)
+
+    quantities = _column_array(table.quantities)
+    unit_prices = _column_array(table.unit_prices)
+    region_codes = _column_array(table['Region'])
+
+    # ---------------- Validation ----------------
+    valid = _table_valid_mask(table)
+    valid_count = int(np.count_nonzero(valid))
+    filter_summary['invalid'] = len(table) - valid_count
+
+    # ---------------- Display Regions ----------------
+    region_values = table['Region'].values
+    regions = sorted(region_values[code] for code in np.unique(region_codes[valid]).tolist())
+    print("Available Regions:", regions)
+
+    # ---------------- Display Amount Range ----------------
+    amounts = quantities * unit_prices      ## One multiplication per row, reused below
+
+    if valid_count:
+        valid_amounts = amounts[valid]
+        print(
+            f"Transaction Amount Range: Min={float(valid_amounts.min())}, Max={float(valid_amounts.max())}")
+    else:
+        print("Transaction Amount Range: No valid transactions")
+
+    # ---------------- Filtering ----------------
+    mask = valid
+    count = valid_count
+
+    # Region Filter
+    if region:
+        region_code = table['Region'].lookup.get(region)
+        mask = mask & (region_codes == region_code) if region_code is not None else np.zeros_like(mask)
+        before, count = count, int(np.count_nonzero(mask))
+        filter_summary['filtered_by_region'] = before - count
+        print("Records after region filter:", count)
+
+    # Amount Filter
+    if min_amount is not None or max_amount is not None:
+        if min_amount is not None:
+            mask = mask & (amounts >= min_amount)
+        if max_amount is not None:
+            mask = mask & (amounts <= max_amount)
+        before, count = count, int(np.count_nonzero(mask))
+        filter_summary['filtered_by_amount'] = before - count
+        print("Records after amount filter:", count)
+
+    # ---------------- Summary ----------------
+    filter_summary['final_count'] = count
+
+    return table.take(np.flatnonzero(mask).tolist()), filter_summary
+
+
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, index=None):
+    """
+    Validates transactions and applies optional filters
+
+    index: optional TableIndex or BitmapIndex built over `transactions`;
+    repeated calls then use its indexes instead of scanning every row
+ """
+
+    if index is not None:
+        if index.table is not transactions:
+            raise ValueError("index was built for a different table")
+        return index.validate_and_filter(region, min_amount, max_amount)
+
+    if isinstance(transactions, TransactionTable):
+        if np is not None:
+            return _validate_and_filter_numpy(transactions, region, min_amount, max_amount)
+        return _validate_and_filter_table(transactions, region, min_amount, max_amount)
+
+    # ---------------- Validation ----------------
+    filter_summary = new_filter_summary()
+    valid_transactions = list(iter_valid_transactions(transactions, filter_summary))
 
     # ---------------- Display Regions ----------------
     regions = sorted({txn['Region'] for txn in valid_transactions})
@@ -126,46 +696,61 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
         print("Transaction Amount Range: No valid transactions")
 
     # ---------------- Filtering ----------------
-    filtered_by_region = 0       ## Initialize counters
-    filtered_by_amount = 0         
     filtered_transactions = valid_transactions
 
     # Region Filter
     if region:
-        before = len(filtered_transactions)
-        filtered_transactions = [
-            txn for txn in filtered_transactions
-            if txn['Region'] == region
-        ]
-        filtered_by_region = before - len(filtered_transactions)
+        filtered_transactions = list(iter_filtered_transactions(
+            filtered_transactions, region=region, summary=filter_summary))
         print("Records after region filter:", len(filtered_transactions))
 
     # Amount Filter
     if min_amount is not None or max_amount is not None:
-        before = len(filtered_transactions)
-        temp = []
+        filtered_transactions = list(iter_filtered_transactions(
+            filtered_transactions, min_amount=min_amount, max_amount=max_amount, summary=filter_summary))
+        print("Records after amount filter:", len(filtered_transactions))
+
+    # ---------------- Summary ----------------
+    filter_summary['final_count'] = len(filtered_transactions)
 
-        for txn in filtered_transactions:
-            amount = txn['Quantity'] * txn['UnitPrice']
+    return filtered_transactions,  filter_summary
 
-            if min_amount is not None and amount < min_amount:
-                continue
-            if max_amount is not None and amount > max_amount:
-                continue
 
-            temp.append(txn)
+#Saving Enriched Data
+ENRICHED_HEADERS = [
+    "TransactionID", "Date", "ProductID", "ProductName",
+    "Quantity", "UnitPrice", "CustomerID", "Region",
+    "API_Category", "API_Brand", "API_Rating", "API_Match"
+]
+OPTIONAL_ENRICHED_HEADERS = ["API_Title", "API_MatchScore"]     ## Written only when present
 
-        filtered_transactions = temp
-        filtered_by_amount = before - len(filtered_transactions)
-        print("Records after amount filter:", len(filtered_transactions))
 
-    # ---------------- Summary ----------------
-    filter_summary = {
-        'total_input': len(transactions),
-        'invalid': invalid_count,
-        'filtered_by_region': filtered_by_region,
-        'filtered_by_amount': filtered_by_amount,
-        'final_count': len(filtered_transactions)
-    }
+def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data.txt'):
+    """
+    Saves enriched transactions back to file
+
+    Accepts a list of dicts or a TransactionTable with enrichment columns
+    """
+
+    # Ensure output directory exists
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+    # Exit if there is no data to save
+    if not len(enriched_transactions):
+        return
+
+    if isinstance(enriched_transactions, TransactionTable):
+        headers = ENRICHED_HEADERS + [h for h in OPTIONAL_ENRICHED_HEADERS if h in enriched_transactions]
+        rows = enriched_transactions.iter_tuples(headers)     ## Column gather, no dicts
+    else:
+        headers = ENRICHED_HEADERS + [h for h in OPTIONAL_ENRICHED_HEADERS if h in enriched_transactions[0]]
+        rows = (tuple(txn.get(header) for header in headers)
+                for txn in enriched_transactions)
+
+    #  Write data to file using pipe delimiter
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("|".join(headers) + "\n")
 
-    return filtered_transactions,  filter_summary
\ No newline at end of file
+        for row in rows:
+            #  Handle None values safely
+            file.write("|".join("" if value is None else str(value) for value in row) + "\n")
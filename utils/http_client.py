@@ -0,0 +1,209 @@
+#Resilient HTTP Client
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+MAX_RETRIES = 3             ## Extra attempts after the first one
+BACKOFF_BASE = 0.5          ## Seconds; doubles every attempt
+BACKOFF_MAX = 8.0           ## Upper bound for one backoff sleep
+CONNECT_TIMEOUT = 3.05      ## Seconds to establish a connection
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+FAILURE_THRESHOLD = 5       ## Consecutive failures that open the circuit
+RESET_TIMEOUT = 30.0        ## Seconds the circuit stays open before a trial call
+RATE_LIMIT = 20.0           ## Requests per second (0 = unlimited)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an upstream that keeps failing
+    """
+
+
+def create_session(max_concurrency):
+    """
+    Creates a requests session whose connection pool fits max_concurrency
+
+    Reusing one session keeps the TCP/TLS connections alive across requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """
+    Exponential backoff with full jitter: uniform in [0, base * 2**attempt]
+
+    The jitter keeps concurrent workers from retrying in lockstep.
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by all threads of a client
+
+    Tokens refill at `rate` per second up to `capacity`; acquire() blocks
+    until a token is available. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures
+
+    closed    -> calls go through; failure_threshold consecutive failures open it
+    open      -> calls raise CircuitOpenError until reset_timeout has passed
+    half-open -> one trial call; success closes the circuit, failure reopens it
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return
+        raise CircuitOpenError(
+            f"circuit open after {self.failures} consecutive failures, "
+            f"retrying in {self.reset_timeout:.0f}s")
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(url):
+    """
+    Returns the process-wide circuit breaker for a URL's host
+
+    Sharing it means a failing upstream is skipped by every later client,
+    not only by the one that saw the failures.
+    """
+    host = urlsplit(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+class HttpClient:
+    """
+    Pooled session with retries, backoff, a circuit breaker and rate limiting
+
+    get() retries connection errors, timeouts and RETRY_STATUSES responses
+    (honouring Retry-After), and returns the final response; callers still
+    call raise_for_status(). Safe to use from several threads at once.
+    """
+
+    def __init__(self, base_url, max_concurrency=8, timeout=10, retries=MAX_RETRIES,
+                 rate_limit=RATE_LIMIT, breaker=None, session=None):
+        self.session = session if session is not None else create_session(max_concurrency)
+        self.timeout = (CONNECT_TIMEOUT, timeout)
+        self.retries = retries
+        self.limiter = TokenBucket(rate_limit)
+        self.breaker = breaker if breaker is not None else circuit_breaker_for(base_url)
+
+    def get(self, url, params=None, headers=None):
+        import requests
+
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            self.limiter.acquire()
+
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+            except Exception:
+                self.breaker.record_failure()       ## Not retried, but never leaves a half-open trial hanging
+                raise
+
+            if response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()       ## 2xx/3xx/4xx: the upstream is healthy
+                return response
+
+            self.breaker.record_failure()
+            if attempt >= self.retries:
+                return response
+            time.sleep(self._retry_after(response) or backoff_delay(attempt))
+            attempt += 1
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return min(float(response.headers.get("Retry-After", "")), BACKOFF_MAX)
+        except ValueError:
+            return None             ## Missing, or an HTTP date: use our own backoff
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
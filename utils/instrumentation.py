@@ -0,0 +1,123 @@
+#Per-Stage Pipeline Instrumentation
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class PipelineProfiler:
+    """
+    Records wall time, CPU time, row counts and peak memory per pipeline stage
+
+    Usage:
+        profiler = PipelineProfiler()
+        with profiler.stage("parse", rows_in=len(lines)) as stage:
+            data = parse_transactions(lines)
+            stage["rows_out"] = len(data)
+
+    A disabled profiler still hands out a stage dict but records nothing,
+    so call sites do not need their own if/else.
+
+    CPU time and the memory peak are process-wide, so stages must not
+    overlap (Pipeline runs them one at a time while profiling).
+    """
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()        ## Peak is measured per stage
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall_start
+            record["cpu_s"] = time.process_time() - cpu_start
+            if self.trace_memory:
+                record["peak_mem_bytes"] = max(tracemalloc.get_traced_memory()[1] - base_memory, 0)
+            else:
+                record["peak_mem_bytes"] = None
+            self.stages.append(record)
+
+    def stop(self):
+        """
+        Stops memory tracing started by this profiler
+        """
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # ---------------- Output ----------------
+    def format_table(self):
+        """
+        Returns the recorded stages as a fixed-width text table
+        """
+        width = max([10] + [len(r["stage"]) for r in self.stages])      ## Stage name column
+        rule = "-" * (width + 52)
+        lines = [
+            f"{'Stage':<{width}} {'Wall(s)':>9} {'CPU(s)':>9} {'Rows in':>10} {'Rows out':>10} {'Peak MB':>9}",
+            rule
+        ]
+
+        def count(value):
+            return "-" if value is None else f"{value:,}"
+
+        for record in self.stages:
+            peak = record["peak_mem_bytes"]
+            lines.append(
+                f"{record['stage']:<{width}} {record['wall_s']:>9.3f} {record['cpu_s']:>9.3f} "
+                f"{count(record['rows_in']):>10} {count(record['rows_out']):>10} "
+                f"{'-' if peak is None else f'{peak / 1e6:.2f}':>9}")
+
+        lines.append(rule)
+        lines.append(f"{'total':<{width}} {sum(r['wall_s'] for r in self.stages):>9.3f} "
+                     f"{sum(r['cpu_s'] for r in self.stages):>9.3f}")
+        return "\n".join(lines)
+
+    def print_table(self):
+        print(self.format_table())
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at,
+            "total_wall_s": sum(r["wall_s"] for r in self.stages),
+            "stages": self.stages
+        }
+
+    def write_json(self, path, metadata=None):
+        """
+        Appends this run to a JSON file of runs, for tracking trends over time
+        """
+        runs = []
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    runs = json.load(f).get("runs", [])
+            except (ValueError, AttributeError):
+                print(f"Warning: {path} is not a profile file, starting a new one.")
+
+        run = self.to_dict()
+        if metadata:
+            run["metadata"] = metadata
+        runs.append(run)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs}, f, indent=2)
@@ -0,0 +1,195 @@
+#Parallel Chunked Parsing Of Large Sales Files
+import csv
+import os
+from multiprocessing import Pool
+
+from utils.data_processor import SalesAggregates, aggregate_sales
+from utils.file_handler import (is_ascii_compatible, iter_filtered_transactions, iter_non_empty_rows,
+                                iter_sales_rows, iter_transactions, iter_valid_transactions,
+                                new_filter_summary, parse_transactions, resolve_encoding,
+                                stream_sales_data)
+
+MIN_CHUNK_BYTES = 1 << 20       ## Below this a chunk is not worth a worker
+MAX_CHUNK_BYTES = 8 << 20       ## Caps what one worker holds at a time, whatever the worker count
+CHUNKS_PER_WORKER = 4           ## Extra chunks even out uneven rows per chunk
+
+
+def chunk_ranges(filename, chunk_count):
+    """
+    Splits a sales file into byte ranges that start and end on line boundaries
+
+    The header line is excluded from the first range.
+
+    Returns: list of (start, end) byte offsets, in file order
+    """
+    size = os.path.getsize(filename)
+
+    with open(filename, "rb") as f:
+        f.readline()                    ## Skip header row
+        data_start = f.tell()
+
+        step = max((size - data_start) // max(chunk_count, 1), 1)
+        ranges = []
+        start = data_start
+
+        while start < size:
+            f.seek(min(start + step, size))
+            f.readline()                ## Run on to the end of the current line
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def _iter_chunk_lines(filename, start, end, encoding):
+    """
+    Decodes one byte range line by line (ranges end on line boundaries)
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode(encoding, errors="replace")
+
+
+def _read_chunk_rows(filename, start, end, encoding):
+    """
+    Lazily yields one byte range's non-empty rows as field lists
+    """
+    return iter_non_empty_rows(csv.reader(_iter_chunk_lines(filename, start, end, encoding), delimiter="|"))
+
+
+def _parse_chunk(task):
+    """
+    Worker: parses one chunk into transactions
+
+    Returns: (transactions, predicate with this chunk's counts or None)
+    """
+    filename, start, end, encoding, as_table, predicate = task
+    rows = _read_chunk_rows(filename, start, end, encoding)
+    return parse_transactions(rows, as_table=as_table, predicate=predicate), predicate
+
+
+def _aggregate_chunk(task):
+    """
+    Worker: parses, validates, filters and aggregates one chunk
+    """
+    filename, start, end, encoding, region, min_amount, max_amount = task
+    summary = new_filter_summary()
+
+    transactions = iter_transactions(_read_chunk_rows(filename, start, end, encoding))
+    valid = iter_valid_transactions(transactions, summary)
+    aggregates = aggregate_sales(iter_filtered_transactions(valid, region, min_amount, max_amount, summary))
+
+    return aggregates, summary
+
+
+def _plan_chunks(filename, encoding, workers):
+    """
+    Picks the byte ranges for a file: enough to keep every worker busy,
+    and never more than MAX_CHUNK_BYTES each
+
+    Returns: list of (start, end) byte offsets
+    """
+    size = os.path.getsize(filename)
+    chunk_count = max(min(workers * CHUNKS_PER_WORKER, size // MIN_CHUNK_BYTES),
+                      -(-size // MAX_CHUNK_BYTES), 1)
+    return chunk_ranges(filename, chunk_count)
+
+
+def _worker_count(workers):
+    """
+    Returns: the worker count to use (None means one per CPU)
+    """
+    return (os.cpu_count() or 1) if workers is None else workers
+
+
+def _run(worker, tasks, workers):
+    """
+    Maps worker over tasks, in-process when a pool would not help
+
+    Results always come back in task (file) order.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [worker(task) for task in tasks]
+
+    with Pool(processes=min(workers, len(tasks))) as pool:
+        return pool.map(worker, tasks)
+
+
+def parse_file_parallel(filename, encoding=None, workers=None, as_table=False, predicate=None):
+    """
+    Parses a sales file using a pool of worker processes
+
+    The output matches parse_transactions(read_sales_data(filename, encoding))
+    row for row, whatever the worker count. With a RowPredicate, rows it
+    rejects are dropped inside the workers and its counters are updated.
+    With a single worker the file is simply streamed, row by row.
+
+    Returns: list of transaction dicts, or a TransactionTable when as_table is True
+    """
+    workers = _worker_count(workers)
+
+    try:
+        encoding = resolve_encoding(filename, encoding)
+        if workers <= 1 or not is_ascii_compatible(encoding):      ## Use the streaming reader
+            return parse_transactions(iter_sales_rows(filename, encoding), as_table=as_table,
+                                      predicate=predicate)
+
+        ranges = _plan_chunks(filename, encoding, workers)
+    except FileNotFoundError:
+        print(f"Error: File {filename} not found.")
+        return parse_transactions([], as_table=as_table)
+
+    tasks = [(filename, start, end, encoding, as_table, predicate.empty_copy() if predicate else None)
+             for start, end in ranges]
+    parts = _run(_parse_chunk, tasks, workers)
+
+    # Merge chunk results back in file order
+    result = parse_transactions([], as_table=as_table)
+    for part, part_predicate in parts:
+        result.extend(part)
+        if predicate is not None:
+            predicate.merge(part_predicate)
+    return result
+
+
+def aggregate_file_parallel(filename, encoding=None, workers=None,
+                            region=None, min_amount=None, max_amount=None):
+    """
+    Validates, filters and aggregates a sales file chunk by chunk in parallel
+
+    Each worker streams its chunk row by row and only the per-chunk partial
+    aggregates travel back to the parent process, so memory grows with the
+    number of distinct products/customers/days, not with the file size.
+
+    Returns: tuple (SalesAggregates, filter_summary)
+    """
+    aggregates = SalesAggregates()
+    filter_summary = new_filter_summary()
+    workers = _worker_count(workers)
+
+    try:
+        encoding = resolve_encoding(filename, encoding)
+        if workers <= 1 or not is_ascii_compatible(encoding):      ## Use the streaming reader
+            transactions = stream_sales_data(filename, encoding, region, min_amount, max_amount, filter_summary)
+            return aggregate_sales(transactions), filter_summary
+
+        ranges = _plan_chunks(filename, encoding, workers)
+    except FileNotFoundError:
+        print(f"Error: File {filename} not found.")
+        return aggregates, filter_summary
+
+    tasks = [(filename, start, end, encoding, region, min_amount, max_amount) for start, end in ranges]
+
+    for part_aggregates, part_summary in _run(_aggregate_chunk, tasks, workers):
+        aggregates.merge(part_aggregates)
+        for key, value in part_summary.items():
+            filter_summary[key] += value
+
+    return aggregates, filter_summary
@@ -0,0 +1,197 @@
+#On-Disk Cache Of Parsed Transactions
+import hashlib
+import os
+import pickle
+
+from utils.file_handler import resolve_encoding
+from utils.mmap_reader import parse_file_mmap
+from utils.transaction_table import TransactionTable
+
+CACHE_DIR = ".cache"
+CACHE_VERSION = 2       ## Bump when the cached layout or the parsers' output changes
+DEFAULT_PARSER_KEY = "mmap"
+
+
+def file_fingerprint(filename, with_hash=True):
+    """
+    Identifies one version of an input file
+
+    Returns: dictionary with path, size, mtime_ns and (optionally) sha256
+    """
+    stat = os.stat(filename)
+    fingerprint = {
+        "path": os.path.abspath(filename),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+
+    return fingerprint
+
+
+def parser_key(name, **options):
+    """
+    Names a parser and the options that shape its output, for cache keys
+
+    e.g. parser_key("parallel") or parser_key("plain", strict=True)
+
+    Returns: string, stable across runs
+    """
+    return name + "".join(f"|{option}={options[option]!r}" for option in sorted(options))
+
+
+def cache_key(filename, encoding, parser=DEFAULT_PARSER_KEY):
+    """
+    Returns the string identifying one cached parse: cache format version,
+    input path, encoding and parser (see parser_key())
+    """
+    return f"v{CACHE_VERSION}|{os.path.abspath(filename)}|{encoding}|{parser}"
+
+
+def cache_path(filename, encoding, cache_dir=CACHE_DIR, parser=DEFAULT_PARSER_KEY):
+    """
+    Returns the cache file used for one input file/encoding/parser combination
+    """
+    key = hashlib.sha1(cache_key(filename, encoding, parser).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"transactions-{key}.pcache")
+
+
+def _is_fresh(cached, current):
+    """
+    Checks a cached fingerprint against the file on disk
+
+    Size and mtime matching is trusted without hashing; if only the mtime
+    moved (e.g. the file was touched or re-copied) the content hash decides.
+    """
+    if cached["path"] != current["path"] or cached["size"] != current["size"]:
+        return False
+    if cached["mtime_ns"] == current["mtime_ns"]:
+        return True
+    return cached["sha256"] == file_fingerprint(current["path"])["sha256"]
+
+
+def _save(path, key, fingerprint, table):
+    """
+    Writes the table's columns to the cache file atomically
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {
+        "version": CACHE_VERSION,
+        "key": key,                     ## Guards against hash collisions and renamed files
+        "fingerprint": fingerprint,
+        "columns": table.columns        ## Typed arrays pickle as raw bytes
+    }
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def _load(path, key):
+    """
+    Reads a cache file written under the given cache key
+
+    Returns: (fingerprint, TransactionTable), or (None, None) if unusable
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None, None
+
+    if payload.get("version") != CACHE_VERSION or payload.get("key") != key:
+        return None, None
+
+    table = TransactionTable.__new__(TransactionTable)
+    table.columns = payload["columns"]
+    return payload["fingerprint"], table
+
+
+def load_transactions_cached(filename, encoding=None, cache_dir=CACHE_DIR, parser=None,
+                             as_table=True, key=None):
+    """
+    Returns the parsed transactions for a file, reusing a cached copy when
+    the file has not changed since it was cached
+
+    parser: callable(filename, encoding) returning a TransactionTable
+    (default: parse_file_mmap)
+    key: parser_key() naming the parser and its options; required with a
+    custom parser, so different parsers never share a cached result
+
+    Returns: TransactionTable, or a list of dicts when as_table is False
+    """
+    if parser is None:
+        parser = lambda name, enc: parse_file_mmap(name, enc, as_table=True)
+        key = key or DEFAULT_PARSER_KEY
+    elif key is None:
+        raise ValueError("key is required with a custom parser (see parser_key())")
+
+    try:
+        current = file_fingerprint(filename, with_hash=False)
+        encoding = resolve_encoding(filename, encoding)
+    except FileNotFoundError:
+        print(f"Error: File {filename} not found.")
+        return TransactionTable() if as_table else []
+
+    full_key = cache_key(filename, encoding, key)
+    path = cache_path(filename, encoding, cache_dir, key)
+    cached_fingerprint, table = _load(path, full_key)
+
+    if table is None or not _is_fresh(cached_fingerprint, current):
+        table = parser(filename, encoding)
+        if not isinstance(table, TransactionTable):
+            table = TransactionTable.from_transactions(table)
+        _save(path, full_key, file_fingerprint(filename), table)
+    elif cached_fingerprint["mtime_ns"] != current["mtime_ns"]:
+        # Same content under a new mtime: refresh the stored fingerprint
+        _save(path, full_key, file_fingerprint(filename), table)
+
+    return table if as_table else list(table)
+
+
+def load_fresh_cache(filename, encoding=None, cache_dir=CACHE_DIR, key=DEFAULT_PARSER_KEY):
+    """
+    Returns the table cached for a file by the parser named by key, only if
+    it is still fresh
+
+    Unlike load_transactions_cached() this never parses; callers that can
+    do a cheaper partial parse (e.g. with a pushed-down filter) use it to
+    prefer a cached full parse when there is one.
+
+    Returns: TransactionTable, or None
+    """
+    try:
+        current = file_fingerprint(filename, with_hash=False)
+        encoding = resolve_encoding(filename, encoding)
+    except FileNotFoundError:
+        return None
+
+    cached_fingerprint, table = _load(cache_path(filename, encoding, cache_dir, key),
+                                      cache_key(filename, encoding, key))
+    if table is None or not _is_fresh(cached_fingerprint, current):
+        return None
+    return table
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """
+    Deletes every cached parse result
+
+    Returns: number of files removed
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pcache"):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
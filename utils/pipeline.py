@@ -0,0 +1,344 @@
+#Stage-Graph Pipeline Executor
+import hashlib
+import io
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+STAGE_CACHE_VERSION = 1     ## Bump when the stage cache layout changes
+
+
+class StageError(Exception):
+    """
+    Raised when a stage still fails after its retries
+    """
+
+    def __init__(self, stage, error):
+        super().__init__(f"stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    """
+    One step of the pipeline graph
+
+    func is called with the values named in `inputs` as keyword arguments
+    and returns one value per name in `outputs` (a tuple when there are
+    several). Stages only see each other through these names, so any two
+    stages without a path between them can run at the same time.
+
+    cache       -- reuse outputs from an earlier run when the inputs are the
+                   same; only for stages without side effects
+    volatile    -- the outputs are not determined by the inputs (network,
+                   prompts), so downstream cache keys use their content
+    fingerprint -- callable(**inputs) returning extra key material, e.g.
+                   input file sizes and mtimes
+    interactive -- run on the main thread with the console (input() prompts)
+    retries     -- extra attempts after a failure
+    version     -- bump when func changes, to invalidate cached outputs
+    rows_in     -- name of the input whose length the profiler records
+    rows_out    -- callable(first output) giving the profiler's row count
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=None, title=None, cache=False,
+                 volatile=False, fingerprint=None, interactive=False, retries=0, version=1,
+                 rows_in=None, rows_out=None):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs is not None else (name,)
+        self.title = title
+        self.cache = cache
+        self.volatile = volatile
+        self.fingerprint = fingerprint
+        self.interactive = interactive
+        self.retries = retries
+        self.version = version
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+
+
+class _StageOutput(io.TextIOBase):
+    """
+    sys.stdout stand-in that keeps each worker thread's prints apart
+
+    Threads running a stage write into that stage's buffer; everything else
+    goes straight to the real stdout.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(pickle.dumps(part, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    Runs a graph of Stages
+
+    - stages start as soon as their inputs exist, up to `workers` at once
+    - each stage's console output is buffered and printed in declaration
+      order under a "[n/step_count] title" header, so the log reads like
+      a sequential run
+    - cached stages store their outputs (and console output) in
+      cache_dir/stages, keyed by a hash of their inputs' keys; a rerun
+      after a failure therefore resumes from the last cached stage
+    - with an enabled profiler stages run one at a time, since CPU time and
+      tracemalloc peaks are process-wide and would mix concurrent stages
+    """
+
+    def __init__(self, stages, cache_dir=None, workers=4, profiler=None, step_count=None):
+        self.stages = list(stages)
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.profiler = profiler
+        self.step_count = step_count or len(self.stages)
+        self.serial = profiler is not None and getattr(profiler, "enabled", True)
+        if self.serial:
+            self.workers = 1
+
+        producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"{output!r} is produced by both {producers[output]!r} and {stage.name!r}")
+                producers[output] = stage.name
+
+    # ---------------- Cache ----------------
+    def _cache_file(self, stage):
+        return os.path.join(self.cache_dir, "stages", f"{stage.name}.pkl")
+
+    def _load_cached(self, stage, key):
+        try:
+            with open(self._cache_file(stage), "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if payload.get("version") != STAGE_CACHE_VERSION or payload.get("key") != key:
+            return None
+        return payload
+
+    def _save_cached(self, stage, key, outputs, log):
+        path = self._cache_file(stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": STAGE_CACHE_VERSION, "key": key, "outputs": outputs, "log": log},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def _value_key(self, name):
+        key = self.keys.get(name)
+        if key is None:         ## Initial value: hash its content
+            key = self.keys[name] = _digest(self.values[name])
+        return key
+
+    def _stage_key(self, stage, inputs):
+        extra = stage.fingerprint(**inputs) if stage.fingerprint else None
+        return _digest(stage.name, stage.version, extra, [self._value_key(name) for name in stage.inputs])
+
+    # ---------------- Execution ----------------
+    def _execute(self, stage, inputs):
+        """
+        Runs one stage (with retries and caching)
+
+        Returns: (outputs tuple, cache key or None, True if loaded from cache)
+        """
+        use_cache = stage.cache and self.cache_dir
+        key = None if stage.volatile else self._stage_key(stage, inputs)     ## Downstream keys build on it
+        if use_cache:
+            payload = self._load_cached(stage, key)
+            if payload is not None:
+                sys.stdout.write(payload["log"])
+                return payload["outputs"], key, True
+
+        attempt = 0
+        while True:
+            log_start = self._buffer_position()
+            try:
+                result = stage.func(**inputs)
+                break
+            except Exception as e:
+                if attempt >= stage.retries:
+                    raise StageError(stage.name, e) from e
+                attempt += 1
+                print(f" Stage {stage.name} failed ({e}), retrying ({attempt}/{stage.retries})")
+
+        outputs = result if len(stage.outputs) > 1 else (result,)
+        if use_cache:
+            try:
+                self._save_cached(stage, key, outputs, self._buffer_text(log_start))
+            except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+                print(f" Warning: Could not cache stage {stage.name}: {e}")
+        return outputs, key, False
+
+    def _buffer_position(self):
+        buffer = getattr(self.output.local, "buffer", None)
+        return buffer.tell() if buffer is not None else None
+
+    def _buffer_text(self, start):
+        buffer = getattr(self.output.local, "buffer", None)
+        if buffer is None or start is None:
+            return ""
+        return buffer.getvalue()[start:]
+
+    def _run_stage(self, stage, position):
+        """
+        Worker-thread body: runs a stage with its output captured
+
+        Returns: (stage, outputs, key, captured text, error)
+        """
+        buffer = io.StringIO()
+        if not stage.interactive:
+            self.output.local.buffer = buffer
+        header = f"\n[{position}/{self.step_count}] {stage.title}" if stage.title else None
+
+        try:
+            if header and stage.interactive:
+                print(header)
+            inputs = {name: self.values[name] for name in stage.inputs}
+            rows_in = inputs.get(stage.rows_in) if stage.rows_in else None
+            with self._profile(stage, rows_in) as record:
+                outputs, key, cached = self._execute(stage, inputs)
+                if record is not None:
+                    first = outputs[0] if outputs else None
+                    if stage.rows_out:
+                        record["rows_out"] = stage.rows_out(first)
+                    elif hasattr(first, "__len__"):
+                        record["rows_out"] = len(first)
+            text = buffer.getvalue()
+            if header and not stage.interactive:
+                text = header + (" (cached)" if cached else "") + "\n" + text
+            return stage, outputs, key, text, None
+        except Exception as e:
+            text = buffer.getvalue()
+            if header and not stage.interactive:
+                text = header + "\n" + text
+            return stage, None, None, text, e
+        finally:
+            self.output.local.buffer = None
+
+    def _profile(self, stage, rows_in):
+        if self.profiler is None:
+            return _NoProfile()
+        return self.profiler.stage(stage.name, rows_in=len(rows_in) if hasattr(rows_in, "__len__") else None)
+
+    def _flush(self):
+        """
+        Prints finished stages' output, in declaration order
+        """
+        while self.flushed < len(self.stages):
+            name = self.stages[self.flushed].name
+            if name not in self.logs:
+                break
+            self.output.stream.write(self.logs.pop(name))
+            self.flushed += 1
+
+    def _record(self, stage, outputs, key):
+        for name, value in zip(stage.outputs, outputs):
+            self.values[name] = value
+            if key is None:
+                self.keys[name] = None      ## Volatile: hashed from content if a later stage needs it
+            else:
+                self.keys[name] = _digest(key, name)
+
+    def run(self, context):
+        """
+        Runs every stage
+
+        context: dictionary of initial values (options, shared objects)
+
+        Returns: dictionary of all values, initial and produced
+        """
+        self.values = dict(context)
+        self.keys = {}
+        self.logs = {}
+        self.flushed = 0
+        positions = {stage.name: i + 1 for i, stage in enumerate(self.stages)}
+        pending = list(self.stages)
+        running = {}
+
+        self.output = _StageOutput(sys.stdout)
+        sys.stdout = self.output
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stage")
+        try:
+            while pending or running:
+                ready = [stage for stage in pending if all(name in self.values for name in stage.inputs)]
+
+                for stage in ready:
+                    if self.serial and running:
+                        break
+                    if not stage.interactive:
+                        pending.remove(stage)
+                        running[pool.submit(self._run_stage, stage, positions[stage.name])] = stage
+
+                # Prompts wait until everything before them has been printed
+                interactive = next((stage for stage in ready if stage.interactive), None)
+                if interactive and (not running or
+                                    (not self.serial and positions[interactive.name] == self.flushed + 1)):
+                    pending.remove(interactive)
+                    self._flush()
+                    self._finish(*self._run_stage(interactive, positions[interactive.name]))
+                    self._flush()
+                    continue
+
+                if not running:
+                    missing = sorted({name for stage in pending for name in stage.inputs
+                                      if name not in self.values})
+                    raise ValueError(f"Pipeline cannot continue, missing inputs: {', '.join(missing)}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    running.pop(future)
+                    self._finish(*future.result())
+                self._flush()
+
+            return self.values
+
+        finally:
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=True)
+            for future, stage in running.items():     ## Stages still running when another failed
+                if not future.cancelled():
+                    self.logs[stage.name] = future.result()[3]
+            for stage in self.stages:         ## Output of finished stages, even after a failure
+                if stage.name in self.logs:
+                    self.output.stream.write(self.logs.pop(stage.name))
+            sys.stdout = self.output.stream
+
+    def _finish(self, stage, outputs, key, text, error):
+        if stage.interactive:
+            self.logs[stage.name] = ""      ## Already printed live
+        else:
+            self.logs[stage.name] = text
+        if error is not None:
+            if not isinstance(error, StageError):
+                error = StageError(stage.name, error)
+            raise error
+        self._record(stage, outputs, key)
+
+
+class _NoProfile:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
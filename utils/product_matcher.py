@@ -0,0 +1,114 @@
+#Fuzzy Product Name Matching
+import re
+from collections import Counter
+
+NGRAM_SIZE = 3
+MIN_MATCH_SCORE = 0.5       ## Dice similarity below this is treated as no match
+MAX_CANDIDATES = 20         ## Titles scored exactly per lookup
+COMMON_GRAM_FRACTION = 0.1  ## Grams in more titles than this are too common to pick candidates
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name):
+    """
+    Lowercase alphanumeric words of a product name
+    """
+    return _TOKEN_PATTERN.findall(str(name).lower())
+
+
+def name_grams(name, n=NGRAM_SIZE):
+    """
+    Character n-grams of each word, padded with spaces
+
+    Grams are taken per word, so word order does not matter:
+    "Mouse Wireless" and "Wireless Mouse" have the same grams.
+    """
+    grams = set()
+    for token in name_tokens(name):
+        padded = f" {token} "
+        grams.update(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return frozenset(grams)
+
+
+class ProductNameIndex:
+    """
+    Inverted n-gram index over catalog titles
+
+    A lookup only touches the postings of the query's grams, keeps the
+    MAX_CANDIDATES titles sharing the most grams and scores those exactly
+    (Dice coefficient of the gram sets), so its cost depends on the query
+    and the matching titles rather than the catalog size. Results are cached
+    per name.
+    """
+
+    def __init__(self, products, min_score=MIN_MATCH_SCORE):
+        """
+        products: iterable of (key, title) pairs
+        """
+        self.min_score = min_score
+        self.keys = []
+        self.titles = []
+        self.grams = []
+        self.postings = {}          ## Gram -> list of title positions
+        self.cache = {}             ## Name -> (key, title, score)
+
+        for key, title in products:
+            if not title:
+                continue
+            position = len(self.keys)
+            grams = name_grams(title)
+            self.keys.append(key)
+            self.titles.append(title)
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+        self.common_limit = max(MAX_CANDIDATES, int(len(self.keys) * COMMON_GRAM_FRACTION))
+
+    @classmethod
+    def from_mapping(cls, product_mapping, min_score=MIN_MATCH_SCORE):
+        """
+        Builds the index from create_product_mapping() output
+        """
+        return cls(((key, info.get("title")) for key, info in product_mapping.items()), min_score)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _candidates(self, grams):
+        postings = [self.postings[gram] for gram in grams if gram in self.postings]
+        selective = [p for p in postings if len(p) <= self.common_limit]
+
+        shared = Counter()
+        for positions in selective or postings:
+            shared.update(positions)
+        return [position for position, _ in shared.most_common(MAX_CANDIDATES)]
+
+    def match(self, name):
+        """
+        Finds the catalog title closest to a product name
+
+        Returns: (key, title, score); key and title are None when no title
+        scores at least min_score
+        """
+        result = self.cache.get(name)
+        if result is not None:
+            return result
+
+        grams = name_grams(name)
+        best_position, best_score = None, 0.0
+
+        for position in self._candidates(grams):
+            title_grams = self.grams[position]
+            score = 2 * len(grams & title_grams) / (len(grams) + len(title_grams))
+            if score > best_score:
+                best_position, best_score = position, score
+
+        if best_position is None or best_score < self.min_score:
+            result = (None, None, best_score)
+        else:
+            result = (self.keys[best_position], self.titles[best_position], best_score)
+
+        self.cache[name] = result
+        return result
@@ -0,0 +1,181 @@
+#Report Generation
+import json
+import os
+from datetime import datetime
+
+from utils.data_processor import (aggregate_sales, customer_analysis, daily_sales_trend,
+                                  region_wise_sales, top_selling_products)
+from utils.transaction_table import TransactionTable
+
+
+def enrichment_summary(enriched_transactions):
+    """
+    Summarises how many transactions the API enrichment matched
+
+    Returns: dictionary with enriched_count, total, success_rate and
+    failed_products
+    """
+    if isinstance(enriched_transactions, TransactionTable):
+        rows = enriched_transactions.iter_tuples(["API_Match", "ProductName"])
+    else:
+        rows = ((t.get("API_Match"), t.get("ProductName")) for t in enriched_transactions)
+
+    total = 0
+    enriched_count = 0
+    failed_products = set()
+
+    for matched, product in rows:
+        total += 1
+        if matched:
+            enriched_count += 1
+        else:
+            failed_products.add(product)
+
+    return {
+        "enriched_count": enriched_count,
+        "total": total,
+        "success_rate": (enriched_count / total) * 100 if total else 0,  # Calculate success rate
+        "failed_products": list(failed_products)
+    }
+
+
+def build_report_analytics(transactions, enriched_transactions, top_n=5):
+    """
+    Collects everything the sales report shows into one analytics result
+
+    Parameters: transactions as a list, TransactionTable or a SalesAggregates
+    from aggregate_sales(); enriched_transactions from enrich_sales_data()
+
+    Returns: dictionary that any render_* function can format without
+    touching the transactions again
+    """
+    aggregates = aggregate_sales(transactions)      ## No-op if already aggregated
+
+    total_transactions = aggregates.transaction_count
+    total_revenue = aggregates.total_revenue
+    dates = list(aggregates.daily)
+
+    customers = customer_analysis(aggregates)
+
+    return {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "records_processed": total_transactions,
+        "total_revenue": total_revenue,
+        "avg_order_value": total_revenue / total_transactions if total_transactions else 0,
+        "date_range": (min(dates), max(dates)) if dates else None,
+        "region_stats": region_wise_sales(aggregates),
+        "top_products": top_selling_products(aggregates, n=top_n),
+        "top_customers": [
+            (customer_id, data["total_spent"], data["purchase_count"])
+            for customer_id, data in list(customers.items())[:top_n]
+        ],
+        "daily_trend": daily_sales_trend(aggregates),
+        "enrichment": enrichment_summary(enriched_transactions)
+    }
+
+
+def render_text_report(analytics):
+    """
+    Formats an analytics result as the plain-text sales report
+
+    Returns: report text
+    """
+    date_range = analytics["date_range"]
+    enrichment = analytics["enrichment"]
+    lines = []
+
+    lines.append("=" * 30)  # Report Header
+    lines.append("       SALES ANALYTICS REPORT")  # Title
+    lines.append(f"   Generated: {analytics['generated_at']}")  # Timestamp
+    lines.append(f"   Records Processed: {analytics['records_processed']}")
+    lines.append("=" * 30 + "\n")  # End Header
+    lines.append("OVERALL SUMMARY")
+    lines.append("-" * 30)
+    lines.append(f"Total Revenue:        ₹{analytics['total_revenue']:,.2f}")
+    lines.append(f"Total Transactions:   {analytics['records_processed']}")
+    lines.append(f"Average Order Value:  ₹{analytics['avg_order_value']:,.2f}")
+    lines.append(
+        f"Date Range:           {date_range[0] + ' to ' + date_range[1] if date_range else 'N/A'}\n")
+
+    lines.append("REGION-WISE PERFORMANCE")
+    lines.append("-" * 30)
+    lines.append("Region    Sales        % Total   Transactions")
+    for region, data in analytics["region_stats"].items():
+        lines.append(
+            f"{region:<9} ₹{data['total_sales']:,.0f}   {data['percentage']:6.2f}%      {data['transaction_count']}")
+    lines.append("")
+
+    lines.append("TOP 5 PRODUCTS")
+    lines.append("-" * 30)
+    for i, (prod, qty, revenue) in enumerate(analytics["top_products"], 1):
+        lines.append(f"{i}. {prod} | Qty: {qty} | Revenue: ₹{revenue:,.2f}")
+    lines.append("")
+
+    lines.append("TOP 5 CUSTOMERS")
+    lines.append("-" * 30)
+    for i, (cust, spent, count) in enumerate(analytics["top_customers"], 1):
+        lines.append(f"{i}. {cust} | Spent: ₹{spent:,.2f} | Orders: {count}")
+    lines.append("")
+
+    lines.append("DAILY SALES TREND")
+    lines.append("-" * 30)
+    for date, data in analytics["daily_trend"].items():
+        lines.append(
+            f"{date} | ₹{data['revenue']:,.2f} | {data['transaction_count']} | {data['unique_customers']}")
+    lines.append("")
+
+    lines.append("API ENRICHMENT SUMMARY")
+    lines.append("-" * 30)
+    lines.append(f"Total Enriched: {enrichment['enriched_count']}")
+    lines.append(f"Success Rate:   {enrichment['success_rate']:.2f}%")
+    lines.append("Failed Products:")
+    for p in enrichment["failed_products"]:
+        lines.append(f"- {p}")
+
+    return "\n".join(lines) + "\n"
+
+
+def render_json_report(analytics):
+    """
+    Formats an analytics result as JSON
+
+    Returns: JSON text
+    """
+    return json.dumps(analytics, ensure_ascii=False, indent=2)
+
+
+REPORT_RENDERERS = {
+    "txt": render_text_report,
+    "json": render_json_report
+}
+
+
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt',
+                          report_format=None):
+    """
+    Generates a comprehensive formatted text report
+
+    transactions may be raw transactions, a SalesAggregates, or an analytics
+    result from build_report_analytics(); in the last case the report is only
+    re-rendered, which makes writing several formats cheap.
+
+    report_format: 'txt' or 'json' (default: taken from the file extension)
+
+    Returns: the analytics result used for the report
+    """
+    if isinstance(transactions, dict) and "enrichment" in transactions:
+        analytics = transactions        ## Already built, just render it
+    else:
+        analytics = build_report_analytics(transactions, enriched_transactions)
+
+    if report_format is None:
+        report_format = "json" if output_file.endswith(".json") else "txt"
+    render = REPORT_RENDERERS[report_format]
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+    # Write Report to File
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(render(analytics))
+
+    return analytics
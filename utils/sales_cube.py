@@ -0,0 +1,249 @@
+#Pre-Aggregated Sales Cube
+import os
+import pickle
+
+from utils.data_processor import SalesAggregates, iter_sales_amounts
+from utils.transaction_table import TransactionTable
+
+CUBE_DIMENSIONS = ('region', 'date', 'product', 'customer')
+CUBE_COLUMNS = ('Region', 'Date', 'ProductName', 'CustomerID')     ## Column behind each dimension
+CUBE_VERSION = 1        ## Bump when the saved layout changes
+
+
+class SalesCube:
+    """
+    Revenue, quantity and transaction count per (region, date, product, customer)
+
+    Every analysis is a roll-up of this one group-by: region_wise_sales
+    sums over date/product/customer, daily_sales_trend over region/product
+    (counting distinct customers), and so on. Once the cube is built, any
+    roll-up or slice costs O(cells) instead of a pass over the rows, and
+    aggregate_sales() accepts a cube in place of the transactions.
+
+    The customer dimension makes cells nearly unique per row on most data,
+    so the cube pays off for repeated slicing of saved results, not for a
+    single report (main.py builds it only with --cube-output).
+
+    cells: (region, date, product, customer) -> [revenue, quantity, count]
+    """
+
+    def __init__(self, cells=None):
+        self.cells = {} if cells is None else cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, region, product, customer_id, date, quantity, amount):
+        """
+        Folds one transaction into its cell (same arguments as SalesAggregates.add)
+        """
+        key = (region, date, product, customer_id)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0.0, 0, 0]
+        cell[0] += amount
+        cell[1] += quantity
+        cell[2] += 1
+
+    def merge(self, other):
+        """
+        Folds another cube (e.g. from a different input file) into this one
+        """
+        for key, (revenue, quantity, count) in other.cells.items():
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = [0.0, 0, 0]
+            cell[0] += revenue
+            cell[1] += quantity
+            cell[2] += count
+        return self
+
+    @property
+    def transaction_count(self):
+        return sum(cell[2] for cell in self.cells.values())
+
+    @property
+    def total_revenue(self):
+        return sum(cell[0] for cell in self.cells.values())
+
+    # ---------------- Slicing and roll-ups ----------------
+    def slice(self, region=None, date=None, product=None, customer=None,
+              start_date=None, end_date=None):
+        """
+        Sub-cube of the cells matching every given condition
+
+        A condition may be one value or a list/tuple/set of values;
+        start_date/end_date bound the date inclusively (ISO strings).
+
+        Returns: SalesCube sharing nothing with this one
+        """
+        conditions = []
+        for position, value in enumerate((region, date, product, customer)):
+            if value is not None:
+                allowed = set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+                conditions.append((position, allowed))
+
+        cells = {}
+        for key, cell in self.cells.items():
+            if any(key[position] not in allowed for position, allowed in conditions):
+                continue
+            if (start_date is not None or end_date is not None) and not key[1]:
+                continue
+            if (start_date is not None and str(key[1]) < start_date) or \
+                    (end_date is not None and str(key[1]) > end_date):
+                continue
+            cells[key] = list(cell)
+        return SalesCube(cells)
+
+    def rollup(self, *dimensions):
+        """
+        Sums the cube over every dimension not listed
+
+        rollup('region') -> {'North': {...}, ...}
+        rollup('region', 'date') -> {('North', '2024-12-01'): {...}, ...}
+        rollup() -> {(): {...}} (grand total)
+
+        Returns: dictionary of {"revenue", "quantity", "count"} per group
+        """
+        unknown = [name for name in dimensions if name not in CUBE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown cube dimension(s): {', '.join(unknown)}")
+        positions = [CUBE_DIMENSIONS.index(name) for name in dimensions]
+        single = len(positions) == 1
+
+        groups = {}
+        for key, (revenue, quantity, count) in self.cells.items():
+            group = key[positions[0]] if single else tuple(key[p] for p in positions)
+            entry = groups.get(group)
+            if entry is None:
+                entry = groups[group] = {"revenue": 0.0, "quantity": 0, "count": 0}
+            entry["revenue"] += revenue
+            entry["quantity"] += quantity
+            entry["count"] += count
+        return groups
+
+    def to_aggregates(self):
+        """
+        Rolls the cube up into the SalesAggregates the analysis functions use
+
+        Returns: SalesAggregates (same groups aggregate_sales() builds from rows)
+        """
+        aggregates = SalesAggregates()
+        regions, products, customers, daily = (
+            aggregates.regions, aggregates.products, aggregates.customers, aggregates.daily)
+
+        for (region, date, product, customer), (revenue, quantity, count) in self.cells.items():
+            aggregates.transaction_count += count
+            aggregates.total_revenue += revenue
+
+            entry = regions.get(region)
+            if entry is None:
+                entry = regions[region] = {"total_sales": 0.0, "transaction_count": 0}
+            entry["total_sales"] += revenue
+            entry["transaction_count"] += count
+
+            entry = products.get(product)
+            if entry is None:
+                entry = products[product] = {"quantity": 0, "revenue": 0.0}
+            entry["quantity"] += quantity
+            entry["revenue"] += revenue
+
+            if customer:
+                entry = customers.get(customer)
+                if entry is None:
+                    entry = customers[customer] = {
+                        "total_spent": 0.0, "purchase_count": 0, "products_bought": set()}
+                entry["total_spent"] += revenue
+                entry["purchase_count"] += count
+                entry["products_bought"].add(product)
+
+            if date:
+                entry = daily.get(date)
+                if entry is None:
+                    entry = daily[date] = {
+                        "revenue": 0.0, "transaction_count": 0, "unique_customers": set()}
+                entry["revenue"] += revenue
+                entry["transaction_count"] += count
+                if customer:
+                    entry["unique_customers"].add(customer)
+
+        return aggregates
+
+    # ---------------- Persistence ----------------
+    def save(self, path, source=None):
+        """
+        Writes the cube atomically
+
+        source: anything identifying what the cube was built from (input
+        fingerprints, filters); load_sales_cube() can check it
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = {"version": CUBE_VERSION, "source": source,
+                   "dimensions": CUBE_DIMENSIONS, "cells": self.cells}
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+
+def _table_cells(table):
+    """
+    One pass over a TransactionTable, grouping on dictionary codes
+
+    Group keys are decoded to strings once per cell at the end.
+    """
+    cells = {}
+    rows = zip(table['Region'].codes, table['Date'].codes, table['ProductName'].codes,
+               table['CustomerID'].codes, table.quantities, table.unit_prices)
+
+    for region, date, product, customer, quantity, unit_price in rows:
+        key = (region, date, product, customer)
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [0.0, 0, 0]
+        cell[0] += quantity * unit_price
+        cell[1] += quantity
+        cell[2] += 1
+
+    values = [table[name].values for name in CUBE_COLUMNS]
+    return {tuple(column[code] for column, code in zip(values, key)): cell
+            for key, cell in cells.items()}
+
+
+def build_sales_cube(transactions):
+    """
+    Builds the cube in a single pass over the transactions
+
+    Returns: SalesCube
+    """
+    if isinstance(transactions, SalesCube):
+        return transactions
+    if isinstance(transactions, TransactionTable):
+        return SalesCube(_table_cells(transactions))
+
+    cube = SalesCube()
+    for row in iter_sales_amounts(transactions):
+        cube.add(*row)
+    return cube
+
+
+def load_sales_cube(path, source=None):
+    """
+    Loads a saved cube
+
+    source: when given, the cube is only returned if it was saved with the
+    same source
+
+    Returns: SalesCube, or None if the file is missing, stale or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    if payload.get("version") != CUBE_VERSION or payload.get("dimensions") != CUBE_DIMENSIONS:
+        return None
+    if source is not None and payload.get("source") != source:
+        return None
+    return SalesCube(payload["cells"])
@@ -0,0 +1,226 @@
+#Secondary Indexes over a TransactionTable
+from array import array
+from bisect import bisect_left, bisect_right
+
+from utils.file_handler import new_filter_summary, valid_table_positions
+
+HASH_INDEX_COLUMNS = ('Region', 'ProductID', 'CustomerID')
+
+
+def group_positions(column, positions):
+    """
+    Buckets row positions by the value of a DictionaryColumn
+
+    Returns: dictionary value -> array of positions (in the given order)
+    """
+    codes = column.codes
+    buckets = {}                ## Dictionary code -> row positions
+    for i in positions:
+        code = codes[i]
+        bucket = buckets.get(code)
+        if bucket is None:
+            bucket = buckets[code] = array('i')
+        bucket.append(i)
+    return {column.values[code]: bucket for code, bucket in buckets.items()}
+
+
+class SortedIndex:
+    """
+    Row positions sorted by a key, so a key range is two binary searches
+    """
+
+    def __init__(self, positions, key, typecode=None):
+        self.positions = sorted(positions, key=key)
+        keys = map(key, self.positions)
+        self.keys = array(typecode, keys) if typecode else list(keys)
+
+    @classmethod
+    def for_amounts(cls, amounts, positions):
+        """
+        Index on Quantity * UnitPrice (NaN amounts never match a range, so they are left out)
+        """
+        return cls((i for i in positions if amounts[i] == amounts[i]), amounts.__getitem__, 'd')
+
+    @classmethod
+    def for_column(cls, column, positions):
+        """
+        Index on a DictionaryColumn's values, compared as strings (ISO dates sort correctly)
+        """
+        names = [str(value) for value in column.values]
+        codes = column.codes
+        return cls(positions, lambda i: names[codes[i]])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def range(self, low=None, high=None):
+        """
+        Positions with low <= key <= high (None leaves that side open)
+
+        Returns: list of row positions, ordered by key
+        """
+        lo = 0 if low is None else bisect_left(self.keys, low)
+        hi = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.positions[lo:hi]
+
+    def bounds(self):
+        """
+        Returns: (smallest, largest) key, or None when the index is empty
+        """
+        if not self.keys:
+            return None
+        return self.keys[0], self.keys[-1]
+
+
+class TableIndex:
+    """
+    In-memory secondary indexes over the valid rows of a TransactionTable
+
+    Built once, then reused for any number of queries on the same table:
+
+    - hash indexes on Region, ProductID and CustomerID (value -> row
+      positions), so an equality lookup costs O(matches)
+    - sorted indexes on Date and on the computed amount, so a range is two
+      binary searches
+
+    Validation also runs only once, when the index is built; every query
+    sees the valid rows only. Positions are in row order within each hash
+    bucket.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.valid = valid_table_positions(table)
+        self.amounts = table.amounts()
+
+        self.hashes = {name: group_positions(table[name], self.valid) for name in HASH_INDEX_COLUMNS}
+        self.by_amount = SortedIndex.for_amounts(self.amounts, self.valid)
+        self.by_date = SortedIndex.for_column(table['Date'], self.valid)
+
+    def __len__(self):
+        return len(self.valid)
+
+    # ---------------- Lookups ----------------
+    def lookup(self, name, value):
+        """
+        Valid rows whose `name` column equals value (hash index)
+
+        Returns: array of row positions (empty if the value never occurs)
+        """
+        return self.hashes[name].get(value, array('i'))
+
+    def values(self, name):
+        """
+        Distinct values of a hash-indexed column among the valid rows
+        """
+        return sorted(self.hashes[name])
+
+    def amount_range(self, min_amount=None, max_amount=None):
+        """
+        Valid rows with min_amount <= Quantity * UnitPrice <= max_amount
+
+        Returns: list of row positions, ordered by amount
+        """
+        return self.by_amount.range(min_amount, max_amount)
+
+    def date_range(self, start=None, end=None):
+        """
+        Valid rows with start <= Date <= end (ISO dates compare as strings)
+
+        Returns: list of row positions, ordered by date
+        """
+        return self.by_date.range(start, end)
+
+    def amount_bounds(self):
+        """
+        Returns: (min, max) amount of the valid rows, or None if there are none
+        """
+        return self.by_amount.bounds()
+
+    def query(self, region=None, product_id=None, customer_id=None,
+              start_date=None, end_date=None, min_amount=None, max_amount=None):
+        """
+        Valid rows matching every given condition
+
+        The most selective index supplies the candidates; the remaining
+        conditions are checked on those rows only.
+
+        Returns: list of row positions in row order
+        """
+        candidates = []
+        for name, value in (('Region', region), ('ProductID', product_id), ('CustomerID', customer_id)):
+            if value is not None:
+                candidates.append(self.lookup(name, value))
+        if start_date is not None or end_date is not None:
+            candidates.append(self.date_range(start_date, end_date))
+        if min_amount is not None or max_amount is not None:
+            candidates.append(self.amount_range(min_amount, max_amount))
+
+        if not candidates:
+            return list(self.valid)
+
+        positions = min(candidates, key=len)
+        if len(candidates) > 1:
+            table = self.table
+            checks = []
+            for name, value in (('Region', region), ('ProductID', product_id), ('CustomerID', customer_id)):
+                if value is not None:
+                    checks.append((table[name].codes, table[name].lookup.get(value)))
+            dates, amounts = table['Date'], self.amounts
+            positions = [i for i in positions
+                         if all(codes[i] == code for codes, code in checks)
+                         and (start_date is None or str(dates[i]) >= start_date)
+                         and (end_date is None or str(dates[i]) <= end_date)
+                         and (min_amount is None or amounts[i] >= min_amount)
+                         and (max_amount is None or amounts[i] <= max_amount)]
+        return sorted(positions)
+
+    # ---------------- validate_and_filter ----------------
+    def validate_and_filter(self, region=None, min_amount=None, max_amount=None):
+        """
+        Same output, prints and filter_summary as validate_and_filter on the
+        indexed table, answered from the indexes
+
+        Returns: (filtered TransactionTable, filter_summary)
+        """
+        filter_summary = new_filter_summary()
+        filter_summary['total_input'] = len(self.table)
+        filter_summary['invalid'] = len(self.table) - len(self.valid)
+
+        # ---------------- Display Regions ----------------
+        print("Available Regions:", self.values('Region'))
+
+        # ---------------- Display Amount Range ----------------
+        bounds = self.amount_bounds()
+        if self.valid and bounds is not None:
+            print(f"Transaction Amount Range: Min={bounds[0]}, Max={bounds[1]}")
+        else:
+            print("Transaction Amount Range: No valid transactions")
+
+        # ---------------- Filtering ----------------
+        positions = self.valid
+        amount_filter = min_amount is not None or max_amount is not None
+
+        # Region Filter
+        if region:
+            positions = self.lookup('Region', region)
+            filter_summary['filtered_by_region'] = len(self.valid) - len(positions)
+            print("Records after region filter:", len(positions))
+
+        # Amount Filter
+        if amount_filter:
+            before = len(positions)
+            if region:
+                amounts = self.amounts
+                positions = [i for i in positions
+                             if (min_amount is None or amounts[i] >= min_amount)
+                             and (max_amount is None or amounts[i] <= max_amount)]
+            else:
+                positions = sorted(self.amount_range(min_amount, max_amount))
+            filter_summary['filtered_by_amount'] = before - len(positions)
+            print("Records after amount filter:", len(positions))
+
+        # ---------------- Summary ----------------
+        filter_summary['final_count'] = len(positions)
+
+        return self.table.take(positions), filter_summary
@@ -0,0 +1,208 @@
+#Columnar Transaction Storage
+from array import array
+from operator import mul
+
+TRANSACTION_COLUMNS = [
+    'TransactionID', 'Date', 'ProductID', 'ProductName',
+    'Quantity', 'UnitPrice', 'CustomerID', 'Region'
+]
+
+
+class DictionaryColumn:
+    """
+    Dictionary-encoded string column
+
+    Each distinct value is stored once in `values`; rows hold a small int
+    code into that list, so repeated regions/products/customers cost 4 bytes
+    per row instead of a str reference plus a dict slot.
+    """
+
+    def __init__(self, values=None, lookup=None):
+        self.codes = array('i')
+        self.values = [] if values is None else values      ## Code -> value
+        self.lookup = {} if lookup is None else lookup      ## Value -> code
+        if values is not None and lookup is None:
+            self.lookup.update((v, i) for i, v in enumerate(values))
+
+    def encode(self, value):
+        code = self.lookup.get(value)
+        if code is None:            ## First time we see this value
+            code = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = code
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def extend(self, other):
+        """
+        Appends another column's rows, re-coding them into this dictionary
+        """
+        recode = [self.encode(value) for value in other.values]
+        self.codes.extend(recode[code] for code in other.codes)
+
+    def take(self, positions):
+        """
+        Returns a new column holding only the given rows
+
+        The dictionary is shared with this column, so codes stay comparable.
+        """
+        column = DictionaryColumn(self.values, self.lookup)
+        codes = self.codes
+        column.codes = array('i', [codes[i] for i in positions])
+        return column
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+def _take(column, positions):
+    """
+    Gathers rows from any supported column type
+    """
+    if isinstance(column, DictionaryColumn):
+        return column.take(positions)
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in positions])
+    return [column[i] for i in positions]
+
+
+class TransactionTable:
+    """
+    Column-oriented container for parsed transactions
+
+    Quantity and UnitPrice live in typed arrays, TransactionID in a plain
+    list and every other field in a DictionaryColumn.  Iterating the table
+    yields the same dictionaries parse_transactions() produces, so code
+    that only knows about rows keeps working.
+    """
+
+    def __init__(self):
+        self.columns = {
+            'TransactionID': [],
+            'Date': DictionaryColumn(),
+            'ProductID': DictionaryColumn(),
+            'ProductName': DictionaryColumn(),
+            'Quantity': array('q'),
+            'UnitPrice': array('d'),
+            'CustomerID': DictionaryColumn(),
+            'Region': DictionaryColumn()
+        }
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """
+        Builds a table from an iterable of transaction dictionaries
+        """
+        table = cls()
+        for txn in transactions:
+            table.append(txn)
+        return table
+
+    # ---------------- Building ----------------
+    def append_row(self, transaction_id, date, product_id, product_name,
+                   quantity, unit_price, customer_id, region):
+        columns = self.columns
+        columns['TransactionID'].append(transaction_id)
+        columns['Date'].append(date)
+        columns['ProductID'].append(product_id)
+        columns['ProductName'].append(product_name)
+        columns['Quantity'].append(quantity)
+        columns['UnitPrice'].append(unit_price)
+        columns['CustomerID'].append(customer_id)
+        columns['Region'].append(region)
+
+    def append(self, txn):
+        self.append_row(*(txn.get(name) for name in TRANSACTION_COLUMNS))
+
+    def extend(self, other):
+        """
+        Appends every row of another table with the same columns
+        """
+        if other.column_names != self.column_names:
+            raise ValueError("Cannot extend a table with different columns")
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+
+    def copy(self):
+        """
+        Returns a table sharing this one's columns
+
+        Adding a column to the copy leaves this table unchanged.
+        """
+        table = TransactionTable.__new__(TransactionTable)
+        table.columns = dict(self.columns)
+        return table
+
+    def add_column(self, name, column):
+        """
+        Attaches an extra column (e.g. API enrichment fields)
+        """
+        if len(column) != len(self):
+            raise ValueError(
+                f"Column {name} has {len(column)} rows, table has {len(self)}")
+        self.columns[name] = column
+
+    # ---------------- Access ----------------
+    def __len__(self):
+        return len(self.columns['TransactionID'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def column_names(self):
+        return list(self.columns)
+
+    @property
+    def quantities(self):
+        return self.columns['Quantity']
+
+    @property
+    def unit_prices(self):
+        return self.columns['UnitPrice']
+
+    def row(self, i):
+        return {name: column[i] for name, column in self.columns.items()}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def iter_tuples(self, names):
+        """
+        Yields one tuple per row for the requested columns
+
+        Columns the table does not have come back as None.
+        """
+        missing = [None] * len(self)
+        return zip(*(self.columns.get(name, missing) for name in names))
+
+    def take(self, positions):
+        """
+        Returns a new table holding only the given row positions
+        """
+        if not isinstance(positions, list):
+            positions = list(positions)
+        table = TransactionTable.__new__(TransactionTable)
+        table.columns = {name: _take(column, positions)
+                         for name, column in self.columns.items()}
+        return table
+
+    # ---------------- Aggregation helpers ----------------
+    def amounts(self):
+        """
+        Returns Quantity * UnitPrice for every row as a float array
+        """
+        return array('d', map(mul, self.quantities, self.unit_prices))